@@ -19,9 +19,12 @@ import sys
 import subprocess
 import webbrowser
 import argparse
-import shutil
+import hashlib
+import itertools
+import io
 from pathlib import Path
 import time
+from contextlib import redirect_stdout, redirect_stderr
 
 
 class DocBuilder:
@@ -32,7 +35,10 @@ class DocBuilder:
         self.build_dir = self.docs_dir / "_build"
         self.html_dir = self.build_dir / "html"
         self.text_dir = self.build_dir / "text"
+        self.doctrees_dir = self.build_dir / ".doctrees"
         self.index_html = self.html_dir / "index.html"
+        self.apidoc_stamp = self.build_dir / ".apidoc.stamp"
+        self.fingerprint_file = self.build_dir / ".fingerprint"
 
     def print_info(self, message, level="INFO"):
         """情報を色付きで出力"""
@@ -59,12 +65,6 @@ class DocBuilder:
             self.print_info("conf.pyが見つかりません。基本的なconf.pyを作成します。", "WARNING")
             self.create_basic_conf()
 
-        # make.batの存在確認（Windows）
-        make_bat = self.docs_dir / "make.bat"
-        if not make_bat.exists() and sys.platform == "win32":
-            self.print_info("make.batが見つかりません。基本的なmake.batを作成します。", "WARNING")
-            self.create_make_bat()
-
         return True
 
     def create_basic_conf(self):
@@ -115,69 +115,142 @@ napoleon_google_docstring = True
 napoleon_numpy_docstring = True
 jquery_use_sri = True
 '''
-        with open(self.docs_dir / "conf.py", "w", encoding="utf-8") as f:
-            f.write(conf_content)
-
-    def create_make_bat(self):
-        """基本的なmake.batを作成"""
-        make_content = '''@ECHO OFF
-
-pushd %~dp0
-
-REM Command file for Sphinx documentation
-
-if "%SPHINXBUILD%" == "" (
-	set SPHINXBUILD=sphinx-build
-)
-set SOURCEDIR=source
-set BUILDDIR=_build
-
-%SPHINXBUILD% >NUL 2>NUL
-if errorlevel 9009 (
-	echo.
-	echo.The 'sphinx-build' command was not found. Make sure you have Sphinx
-	echo.installed, then set the SPHINXBUILD environment variable to point
-	echo.to the full path of the 'sphinx-build' executable. Alternatively you
-	echo.may add the Sphinx directory to PATH.
-	echo.
-	echo.If you don't have Sphinx installed, grab it from
-	echo.https://sphinx-doc.org/
-	exit /b 1
-)
-
-if "%1" == "" goto help
-
-%SPHINXBUILD% -M %1 %SOURCEDIR% %BUILDDIR% %SPHINXOPTS% %O%
-goto end
-
-:help
-%SPHINXBUILD% -M help %SOURCEDIR% %BUILDDIR% %SPHINXOPTS% %O%
-
-:end
-popd
-'''
-        with open(self.docs_dir / "make.bat", "w", encoding="utf-8") as f:
-            f.write(make_content)
+        (self.docs_dir / "conf.py").write_text(conf_content, encoding="utf-8")
+
+    def _fast_rmtree(self, path):
+        """os.scandirでディレクトリを再帰削除（DirEntryの種別キャッシュを使いlstatを省く）"""
+        # ルート自体がシンボリックリンクやファイルなら、リンク先をたどらずそれだけを削除する
+        if os.path.islink(path) or (os.path.lexists(path) and not os.path.isdir(path)):
+            os.unlink(path)
+            return
+
+        def rmtree_dir(dir_path):
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except FileNotFoundError:
+                return
+
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    rmtree_dir(entry.path)
+                else:
+                    os.unlink(entry.path)
+            os.rmdir(dir_path)
+
+        rmtree_dir(path)
 
     def clean_build(self):
-        """ビルドディレクトリをクリーンアップ"""
+        """ビルド出力をクリーンアップ（.doctreesは差分ビルド用に残す）"""
         self.print_info("ビルドディレクトリをクリーンアップ中...")
-        if self.build_dir.exists():
-            shutil.rmtree(self.build_dir)
+        for sub in (self.html_dir, self.text_dir):
+            self._fast_rmtree(sub)
         self.print_info("クリーンアップ完了", "SUCCESS")
 
+    def nuke_doctrees(self):
+        """ビルドディレクトリを.doctreesごと削除（完全なコールドビルド用）"""
+        self.print_info("ビルドディレクトリを完全に削除中...")
+        self._fast_rmtree(self.build_dir)
+        self.print_info("完全削除完了", "SUCCESS")
+
     def clean_source(self):
         """ソースディレクトリの自動生成ファイルをクリーンアップ"""
         self.print_info("ソースディレクトリをクリーンアップ中...")
-        for rst_file in self.source_dir.glob("*.rst"):
-            if rst_file.name != "index.rst":
-                rst_file.unlink()
+        try:
+            with os.scandir(self.source_dir) as it:
+                for entry in it:
+                    if (
+                        entry.name.endswith(".rst")
+                        and entry.name != "index.rst"
+                        and entry.is_file(follow_symlinks=False)
+                    ):
+                        os.unlink(entry.path)
+        except FileNotFoundError:
+            pass  # ソースディレクトリ未作成なら削除対象なし
         self.print_info("ソースクリーンアップ完了", "SUCCESS")
 
-    def run_sphinx_apidoc(self, args):
-        """sphinx-apidocを実行"""
-        self.print_info("API documentation生成中...")
+    def iter_source_stats(self, root, suffixes=(".py",), skip_dirs=("docs",)):
+        """root以下の対象ファイルを(path, st_mtime_ns, st_size)で列挙（隠し・キャッシュ・skip_dirsは除外、suffixes=Noneなら全ファイル）"""
+        stack = [str(root)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        name = entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            if not name.startswith((".", "__pycache__", "_build")) and name not in skip_dirs:
+                                stack.append(entry.path)
+                        elif suffixes is None or name.endswith(suffixes):
+                            st = entry.stat(follow_symlinks=False)
+                            yield entry.path, st.st_mtime_ns, st.st_size
+            except OSError:
+                continue
+
+    def _digest_stats(self, stats, extra=()):
+        """ファイル統計と追加文字列からハッシュを計算"""
+        digest = hashlib.blake2b(digest_size=16)
+        for path, mtime_ns, size in sorted(stats):
+            digest.update(f"{path}:{mtime_ns}:{size}\n".encode("utf-8"))
+        digest.update("\0".join(extra).encode("utf-8"))
+        return digest.hexdigest()
+
+    def package_dirs(self):
+        """apidocの対象パッケージ（__init__.pyを持つ直下のディレクトリ。test*・隠しは除く）"""
+        with os.scandir(self.project_root) as it:
+            return [
+                entry.path for entry in it
+                if not entry.name.startswith(("test", ".", "_"))
+                and entry.is_dir(follow_symlinks=False)
+                and os.path.isfile(os.path.join(entry.path, "__init__.py"))
+            ]
+
+    def iter_python_stats(self):
+        """apidocが読むPythonソース（ルート直下のモジュールと各パッケージ）を列挙（venv等は歩かない）"""
+        with os.scandir(self.project_root) as it:
+            for entry in it:
+                if entry.name.endswith(".py") and entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    yield entry.path, st.st_mtime_ns, st.st_size
+        for package in self.package_dirs():
+            yield from self.iter_source_stats(package)
+
+    def apidoc_digest(self, excludes):
+        """apidocの入力（.pyファイル一覧・mtime・サイズ・除外パターン）のハッシュを計算"""
+        return self._digest_stats(self.iter_python_stats(), excludes)
+
+    def fingerprint(self, args):
+        """ビルド入力全体（Pythonソースと、docs/以下のSphinxが読む全ファイル）のハッシュを計算"""
+        # docs/ は .rst/.md のほか _static・_templates の中身や conf.py も読まれるため、
+        # 拡張子で絞らず _build 以外の全ファイルを対象にする
+        stats = itertools.chain(
+            self.iter_python_stats(),
+            self.iter_source_stats(self.docs_dir, suffixes=None, skip_dirs=()),
+        )
+        return self._digest_stats(stats, args.exclude or ())
+
+    def is_up_to_date(self, args):
+        """前回ビルドから入力が変わっておらず、出力も揃っているか"""
+        if (args.full_rebuild or args.clean or args.clean_source
+                or args.nuke_doctrees or args.no_build):
+            return False
+        if not self.index_html.exists():
+            return False
+        if args.text and not args.no_text and not self.text_dir.exists():
+            return False
+        try:
+            stored = self.fingerprint_file.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return False
+        return stored == self.fingerprint(args)
+
+    def save_fingerprint(self, args):
+        """ビルド後の入力のハッシュを保存"""
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        self.fingerprint_file.write_text(self.fingerprint(args), encoding="utf-8")
 
+    def run_sphinx_apidoc(self, args):
+        """sphinx-apidocを実行（入力が前回から変わっていなければスキップ）"""
         # 基本コマンドの構築
         cmd = [
             "sphinx-apidoc",
@@ -203,10 +276,24 @@ popd
 
         cmd.extend(excludes)
 
+        # 入力が変わっていなければ.rstを書き換えない（mtimeを保ちSphinxの差分ビルドを活かす）
+        digest = self.apidoc_digest(excludes)
+        if (
+            self.apidoc_stamp.exists()
+            and (self.source_dir / "modules.rst").exists()
+            and self.apidoc_stamp.read_text(encoding="utf-8") == digest
+        ):
+            self.print_info("Pythonソースに変更がないため、API documentation生成をスキップ")
+            return True
+
+        self.print_info("API documentation生成中...")
+
         try:
             result = subprocess.run(
                 cmd, capture_output=True, text=True, cwd=self.project_root)
             if result.returncode == 0:
+                self.build_dir.mkdir(parents=True, exist_ok=True)
+                self.apidoc_stamp.write_text(digest, encoding="utf-8")
                 self.print_info("API documentation生成完了", "SUCCESS")
                 if args.verbose:
                     print(result.stdout)
@@ -221,28 +308,47 @@ popd
 
         return True
 
+    def sphinx_build_args(self, builder, out_dir, jobs="auto"):
+        """sphinx-buildの引数を構築（-jで並列ビルド）"""
+        return [
+            "-j", str(jobs),  # 並列数（autoでCPU数）
+            "-b", builder,
+            "-d", str(self.doctrees_dir),  # 出力削除後も差分キャッシュを保持
+            str(self.docs_dir),  # conf.pyのあるディレクトリ
+            str(out_dir),
+        ]
+
+    def run_sphinx_build(self, builder, out_dir, jobs="auto"):
+        """
+        Sphinxをプロセス内で実行（make/sphinx-buildの起動コストを省く）
+        Returns: (returncode, stdout, stderr)
+        """
+        from sphinx.cmd.build import build_main
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            returncode = build_main(self.sphinx_build_args(builder, out_dir, jobs))
+        return returncode, stdout.getvalue(), stderr.getvalue()
+
     def build_html(self, args):
         """HTMLドキュメントをビルド"""
         self.print_info("HTMLドキュメントをビルド中...")
 
-        if sys.platform == "win32":
-            make_cmd = [str(self.docs_dir / "make.bat"), "html"]
-        else:
-            make_cmd = ["make", "-C", str(self.docs_dir), "html"]
-
         try:
-            result = subprocess.run(make_cmd, capture_output=True, text=True)
-            if result.returncode == 0:
+            returncode, stdout, stderr = self.run_sphinx_build(
+                "html", self.html_dir, args.jobs)
+            if returncode == 0:
                 self.print_info("HTMLビルド完了", "SUCCESS")
                 if args.verbose:
-                    print(result.stdout)
+                    print(stdout)
             else:
-                self.print_info(f"HTMLビルドでエラーが発生: {result.stderr}", "ERROR")
+                self.print_info(f"HTMLビルドでエラーが発生: {stderr}", "ERROR")
                 if args.verbose:
-                    print(result.stdout)
+                    print(stdout)
                 return False
-        except FileNotFoundError:
-            self.print_info("makeコマンドが見つかりません。", "ERROR")
+        except ImportError:
+            self.print_info(
+                "Sphinxが見つかりません。Sphinxがインストールされているか確認してください。", "ERROR")
             return False
 
         return True
@@ -251,24 +357,21 @@ popd
         """テキストドキュメントをビルド"""
         self.print_info("テキストドキュメントをビルド中...")
 
-        if sys.platform == "win32":
-            make_cmd = [str(self.docs_dir / "make.bat"), "text"]
-        else:
-            make_cmd = ["make", "-C", str(self.docs_dir), "text"]
-
         try:
-            result = subprocess.run(make_cmd, capture_output=True, text=True)
-            if result.returncode == 0:
+            returncode, stdout, stderr = self.run_sphinx_build(
+                "text", self.text_dir, args.jobs)
+            if returncode == 0:
                 self.print_info("テキストビルド完了", "SUCCESS")
                 if args.verbose:
-                    print(result.stdout)
+                    print(stdout)
             else:
-                self.print_info(f"テキストビルドでエラーが発生: {result.stderr}", "ERROR")
+                self.print_info(f"テキストビルドでエラーが発生: {stderr}", "ERROR")
                 if args.verbose:
-                    print(result.stdout)
+                    print(stdout)
                 return False
-        except FileNotFoundError:
-            self.print_info("makeコマンドが見つかりません。", "ERROR")
+        except ImportError:
+            self.print_info(
+                "Sphinxが見つかりません。Sphinxがインストールされているか確認してください。", "ERROR")
             return False
 
         return True
@@ -327,6 +430,7 @@ def main():
   python build_docs.py --clean --open     # クリーンビルドしてブラウザで開く
   python build_docs.py -c -o              # 短縮形
   python build_docs.py --full-rebuild     # 完全な再ビルド
+  python build_docs.py --nuke-doctrees    # キャッシュも削除してコールドビルド
   python build_docs.py -f                 # 完全な再ビルド（短縮形）
   python build_docs.py --text             # テキスト形式も生成
   python build_docs.py -t                 # テキスト形式も生成（短縮形）
@@ -341,6 +445,8 @@ def main():
                         help="ソースディレクトリの自動生成ファイルをクリーンアップ")
     parser.add_argument("--full-rebuild", "-f", action="store_true",
                         help="完全な再ビルド（--clean + --clean-source）")
+    parser.add_argument("--nuke-doctrees", action="store_true",
+                        help=".doctreesを含むビルドディレクトリ全体を削除（コールドビルド）")
     parser.add_argument("--open", "-o", action="store_true",
                         help="ビルド後にブラウザで開く")
     parser.add_argument("--browser", "-b", type=str,
@@ -356,6 +462,9 @@ def main():
     parser.add_argument("--no-text", action="store_true",
                         help="テキスト形式のドキュメント生成を無効化")
 
+    parser.add_argument("--jobs", "-j", type=str, default="auto",
+                        help="Sphinxの並列ビルド数 (デフォルト: auto)")
+
     # 除外オプション
     parser.add_argument("--exclude", "-e", nargs="*", default=[],
                         help="除外するパターンを指定")
@@ -375,17 +484,26 @@ def main():
         builder.show_info()
         return
 
-    # 環境チェック
-    if not builder.check_requirements():
-        sys.exit(1)
-
     # 完全再ビルド
     if args.full_rebuild:
         args.clean = True
         args.clean_source = True
 
+    # 入力に変更がなければビルド全体をスキップ
+    if builder.is_up_to_date(args):
+        builder.print_info("ソースに変更がないため、ビルドをスキップします（最新）", "SUCCESS")
+        if args.open:
+            builder.open_in_browser(args.browser)
+        return
+
+    # 環境チェック
+    if not builder.check_requirements():
+        sys.exit(1)
+
     # クリーンアップ
-    if args.clean:
+    if args.nuke_doctrees:
+        builder.nuke_doctrees()
+    elif args.clean:
         builder.clean_build()
 
     if args.clean_source:
@@ -402,10 +520,16 @@ def main():
             sys.exit(1)
 
     # テキストビルド
+    text_ok = True
     if args.text and not args.no_text:
-        if not builder.build_text(args):
+        text_ok = builder.build_text(args)
+        if not text_ok:
             builder.print_info("テキストビルドでエラーが発生しましたが、処理を続行します。", "WARNING")
 
+    # 次回の差分判定用に、ビルド後の状態のハッシュを保存
+    if not args.no_build and text_ok:
+        builder.save_fingerprint(args)
+
     # ブラウザで開く
     if args.open:
         time.sleep(1)  # ビルド完了を待つ
@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Tuple, Dict
+from typing import Any, Iterator, List, Tuple, Dict
 
 
 ##
 # @brief データベース管理のインターフェース
 class DBManagerInterface(ABC):
+    # 実装クラスが __slots__ で属性を固定できるよう、インターフェース側は属性を持たない
+    __slots__ = ()
+
     @abstractmethod
     def create_table(self, table_name: str, columns: Dict[str, str]):
         """
@@ -14,6 +17,16 @@ class DBManagerInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def create_index(
+        self, table_name: str, columns: Tuple[str, ...], unique: bool = False
+    ):
+        """
+        インデックスを作成する（既にあれば何もしない）。
+        columns: インデックスに含める列名のタプル
+        """
+        pass
+
     @abstractmethod
     def insert(self, table_name: str, data: Dict[str, Any]) -> int | None:
         """
@@ -23,21 +36,72 @@ class DBManagerInterface(ABC):
         pass
 
     @abstractmethod
-    def fetch_all(self, table_name: str) -> List[Dict[str, Any]]:
+    def bulk_insert(self, table_name: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        複数レコードを1トランザクションでまとめて挿入する。
+        rowsは同じ列構成の {"列名": 値} のリストで指定する。
+        戻り値は挿入した件数（失敗時は0、全件ロールバック）。
+        """
+        pass
+
+    @abstractmethod
+    def fetch_all(
+        self, table_name: str, columns: List[str] | None = None
+    ) -> List[Dict[str, Any]]:
         """
         テーブル内の全レコードを取得する。
         戻り値は各レコードを辞書で表したリスト。
+        columns: 取得する列名のリスト（省略時は全列）
         """
         pass
 
     @abstractmethod
     def fetch_where(
-        self, table_name: str, condition: str, params: Tuple[Any, ...]
+        self,
+        table_name: str,
+        condition: str,
+        params: Tuple[Any, ...],
+        columns: List[str] | None = None,
     ) -> List[Dict[str, Any]]:
         """
         条件に一致するレコードを取得する。
         condition: "age > ?" のようなSQL条件式
         params: (20,) のようなプレースホルダに対応する値のタプル
+        columns: 取得する列名のリスト（省略時は全列）
+        """
+        pass
+
+    @abstractmethod
+    def iter_all(self, table_name: str, chunk: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        テーブルの全レコードを1件ずつ返すイテレータ。
+        chunk: 1回のfetchで取り出す件数
+        """
+        pass
+
+    @abstractmethod
+    def iter_where(
+        self, table_name: str, condition: str, params: Tuple[Any, ...]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        条件に一致するレコードを1件ずつ返すイテレータ。
+        大きな結果セットを全件メモリに展開せずに処理したい場合に使う。
+        """
+        pass
+
+    @abstractmethod
+    def count(
+        self, table_name: str, condition: str = "", params: Tuple[Any, ...] = ()
+    ) -> int:
+        """
+        条件に一致するレコード数を返す。条件を省略すると全件数。
+        """
+        pass
+
+    @abstractmethod
+    def exists(self, table_name: str, condition: str, params: Tuple[Any, ...]) -> bool:
+        """
+        条件に一致するレコードが存在するかを返す。
         """
         pass
 
@@ -57,6 +121,21 @@ class DBManagerInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def update_many(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        key_columns: Tuple[str, ...],
+    ) -> int:
+        """
+        複数レコードをまとめて更新する。
+        rows: 更新する列とキー列を含む辞書のリスト（全行で同じ列構成）
+        key_columns: WHERE句に使う列名のタプル
+        戻り値は更新件数。
+        """
+        pass
+
     @abstractmethod
     def delete(self, table_name: str, condition: str, params: Tuple[Any, ...]):
         """
@@ -64,9 +143,35 @@ class DBManagerInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def delete_many(
+        self, table_name: str, condition: str, params_list: List[Tuple[Any, ...]]
+    ) -> int:
+        """
+        同じ条件式で複数回の削除をまとめて行う。
+        params_list: 条件に対応する値のタプルのリスト
+        戻り値は削除件数。
+        """
+        pass
+
     @abstractmethod
     def close(self):
         """
         データベース接続を閉じる。
         """
         pass
+
+    @abstractmethod
+    def get_table_schema(self, table_name: str) -> List[Dict[str, Any]]:
+        """
+        テーブルの列定義を取得する。
+        戻り値は各列を {"name": 列名, "type": 型, ...} の辞書で表したリスト。
+        """
+        pass
+
+    @abstractmethod
+    def get_column_names(self, table_name: str) -> List[str]:
+        """
+        テーブルの列名一覧を取得する。
+        """
+        pass
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Tuple
 
 IMAGE_SCHEMA = {
     "id"           : "INTEGER PRIMARY KEY AUTOINCREMENT",
@@ -21,6 +21,9 @@ IMAGE_SCHEMA = {
     "created_at"    : "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
 }
 
+# WHERE句で絞り込みに使う列（hashはUNIQUE制約で既にインデックスがある）
+IMAGE_INDEXES: Tuple[str, ...] = ("collection", "image_type", "parent_image_id", "format")
+
 FLASHCARD_SCHEMA = {
     "id"           : "INTEGER PRIMARY KEY AUTOINCREMENT",
     "filename"     : "TEXT NOT NULL",                     # 実際のファイル名
@@ -38,3 +41,5 @@ FLASHCARD_SCHEMA = {
     "created_at": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
     "updated_at": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
 }
+
+FLASHCARD_INDEXES: Tuple[str, ...] = ("collection",)
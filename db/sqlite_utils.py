@@ -1,80 +1,564 @@
+import os
 import sqlite3
-from typing import Any, List, Tuple, Dict
+import threading
+import weakref
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from typing import Any, Callable, Iterator, List, Set, Tuple, Dict
 from .interface_utils import DBManagerInterface
 from utils import log
 from pathlib import Path
 
 
+# 同じ形（テーブル・列・条件）のSQLは毎回組み立てず、キャッシュした文字列を再利用する
+@lru_cache(maxsize=256)
+def _build_insert_sql(table_name: str, columns: Tuple[str, ...]) -> str:
+    placeholders = ", ".join("?" * len(columns))
+    return f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+@lru_cache(maxsize=256)
+def _build_update_sql(table_name: str, columns: Tuple[str, ...], condition: str) -> str:
+    set_clause = ", ".join(f"{col} = ?" for col in columns)
+    return f"UPDATE {table_name} SET {set_clause} WHERE {condition}"
+
+
+@lru_cache(maxsize=256)
+def _build_select_sql(table_name: str, projection: str = "*") -> str:
+    return f"SELECT {projection} FROM {table_name}"
+
+
+@lru_cache(maxsize=256)
+def _build_where_sql(statement: str, table_name: str, condition: str) -> str:
+    return f"{statement} FROM {table_name} WHERE {condition}"
+
+
+def _serialized(method):
+    """
+    書き込み用接続(self.conn)を使うメソッドを書き込みロックで直列化する。
+    SQLiteの書き込みは常に1本なので、スレッド間で操作やトランザクションが混ざらないようにする。
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _iter_dicts(cursor: sqlite3.Cursor) -> Iterator[Dict[str, Any]]:
+    """
+    カーソルの各行を辞書にして返す。
+    dict(row) は行ごとに keys() を引き直すため、列名は description から1度だけ取り出して zip する。
+    """
+    if cursor.description is None:
+        return
+    columns = tuple(desc[0] for desc in cursor.description)
+    for row in cursor:
+        yield dict(zip(columns, row))
+
+
+class _ReaderHandle:
+    """
+    スレッドローカルに置く読み取り専用接続の持ち手。
+    スレッドが終了するとスレッドローカルごと破棄されるので、その時点で接続を手放す。
+    """
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _drop_reader(
+    readers: Set[sqlite3.Connection], lock: threading.Lock, conn: sqlite3.Connection
+):
+    # 終了したスレッドの接続を一覧から外す。走査中のカーソルが残っていても壊さないよう
+    # ここでは close せず、最後の参照が消えた時点で接続が閉じられるのに任せる
+    with lock:
+        readers.discard(conn)
+
+
 class SQLiteManager(DBManagerInterface):
-    def __init__(self, db_path: Path):
-        self.db_path = db_path
+    # 属性を固定し、インスタンス辞書を持たない（属性アクセスの高速化・省メモリ）
+    __slots__ = (
+        "db_path",
+        "conn",
+        "cursor",
+        "_tx_depth",
+        "_tx_owner",
+        "_write_lock",
+        "_schema_cache",
+        "_column_cache",
+        "_use_readers",
+        "_local",
+        "_readers",
+        "_readers_lock",
+        "_query_cache_rows",
+        "_query_cache_total",
+        "_query_cache",
+        "_query_cache_lock",
+        "_cache_data_version",
+        "_cache_generation",
+    )
+
+    def __init__(self, db_path: Path, query_cache_rows: int = 0):
+        # 読み取り専用接続は後から開くため、カレントディレクトリが変わっても同じファイルを指すよう絶対パスにする
+        self.db_path = (
+            db_path if str(db_path) == ":memory:" else os.path.abspath(db_path)
+        )
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            # キャッシュ済みSQL文字列と合わせて、準備済みステートメントを接続中に再利用する
+            # 型変換は行わない(detect_types=0)。TIMESTAMP列も行ごとに変換せず文字列のまま返す
+            self.conn = sqlite3.connect(
+                self.db_path,
+                detect_types=0,
+                cached_statements=512,
+                isolation_level="DEFERRED",
+                check_same_thread=False,
+            )
             self.conn.row_factory = sqlite3.Row
             self.cursor = self.conn.cursor()
-            log.info(f"SQLite database connection established: {self.db_path}")
-        except Exception as e:
-            log.error(f"Failed to connect to SQLite database {self.db_path}: {e}")
+            self._apply_pragmas()
+            self._tx_depth = 0  # with文によるトランザクションのネスト数
+            self._tx_owner = None  # with文のトランザクションを実行中のスレッドID
+            # 書き込みは1スレッドずつ。with文の間は同じスレッドが持ち続ける(再入可能)
+            self._write_lock = threading.RLock()
+            self._schema_cache: Dict[str, List[Dict[str, Any]]] = {}
+            self._column_cache: Dict[str, List[str]] = {}
+            # 読み取り専用接続をスレッドごとに持ち、WALのスナップショットで並行にSELECTさせる
+            # (:memory: は接続ごとに別DBになるため、書き込み用接続を共有する)
+            self._use_readers = str(self.db_path) != ":memory:"
+            self._local = threading.local()
+            self._readers: Set[sqlite3.Connection] = set()
+            self._readers_lock = threading.Lock()
+            # 同じSELECT(SQL文+パラメータ)の結果をLRUで保持する。
+            # 上限はキャッシュ全体の行数。既定の0では無効(同じ検索を繰り返す呼び出し側だけ有効にする)
+            self._query_cache_rows = query_cache_rows
+            self._query_cache_total = 0  # キャッシュ中の行数の合計
+            self._query_cache: OrderedDict[
+                Tuple[str, Tuple[Any, ...]],
+                Tuple[str, Tuple[str, ...], List[Tuple[Any, ...]]],
+            ] = OrderedDict()
+            self._query_cache_lock = threading.Lock()
+            self._cache_data_version = None
+            # 破棄のたびに増やし、破棄をまたいだ結果を保存しない
+            self._cache_generation = 0
+            log.info("SQLite database connection established: %s", self.db_path)
+        except sqlite3.Error as e:
+            log.error("Failed to connect to SQLite database %s: %s", self.db_path, e)
+            raise
+
+    def _apply_pragmas(self):
+        """接続直後の性能チューニング（WAL・fsync削減・キャッシュ/mmap拡大）"""
+        # page_size と auto_vacuum は最初のテーブル作成前（かつWAL化の前）でないと反映されない
+        if self.cursor.execute("PRAGMA page_count").fetchone()[0] == 0:
+            self.cursor.execute("PRAGMA page_size=8192")
+            # 削除時にファイルを詰め直さず、incremental_vacuum() で明示的に回収する
+            self.cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # WAL + synchronous=NORMAL でコミットごとのfsyncを減らし、読み取りと書き込みを並行させる
+        # (:memory: ではWALは使えないのでスキップ)
+        if str(self.db_path) != ":memory:":
+            journal_mode = self.cursor.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            self.cursor.execute("PRAGMA wal_autocheckpoint=1000")
+            self.cursor.execute("PRAGMA journal_size_limit=67108864")  # 64MiB
+            log.debug("SQLite journal_mode: %s (%s)", journal_mode, self.db_path)
+        self.cursor.execute("PRAGMA synchronous=NORMAL")
+        self.cursor.execute("PRAGMA temp_store=MEMORY")
+        self.cursor.execute("PRAGMA cache_size=-65536")  # 64MiB
+        self.cursor.execute("PRAGMA mmap_size=268435456")  # 256MiB
+
+    def _read_conn(self) -> sqlite3.Connection:
+        """
+        SELECT用の接続を返す。書き込みは self.conn の1本だけで行い、読み取りは
+        スレッドごとの読み取り専用接続に分けて、共有カーソルの取り合いをなくす。
+        未コミットの変更を読めるよう、自スレッドのトランザクション中は self.conn を使う。
+        スレッドが終了すると、そのスレッドの接続は一覧から外れて閉じられる。
+        """
+        if (
+            not self._use_readers
+            or self._tx_owner == threading.get_ident()
+            or (self._tx_owner is None and self.conn.in_transaction)
+        ):
+            return self.conn
+        handle = getattr(self._local, "reader", None)
+        if handle is None:
+            conn = self._open_reader()
+            handle = _ReaderHandle(conn)
+            with self._readers_lock:
+                self._readers.add(conn)
+            weakref.finalize(
+                handle, _drop_reader, self._readers, self._readers_lock, conn
+            )
+            self._local.reader = handle
+        return handle.conn
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """読み取り専用の接続を新しく開く"""
+        conn = sqlite3.connect(
+            self.db_path,
+            detect_types=0,
+            cached_statements=512,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA cache_size=-16384")  # 16MiB
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MiB
+        return conn
+
+    def _iter_query(
+        self, sql: str, params: Tuple[Any, ...], chunk: int
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        SELECTの結果を fetchmany で chunk 件ずつ取り出し、1件ずつ辞書で返す。
+        走査中の接続はWALのスナップショットを持ち続けるため、スレッドの読み取り接続とは
+        別の接続を走査の間だけ開く（走査中に自スレッドが書き込んだ後の読み取りが古い結果を返さない）。
+        """
+        conn = self._read_conn()
+        dedicated = conn is not self.conn
+        if dedicated:
+            conn = self._open_reader()
+        try:
+            cursor = conn.execute(sql, params)
+            cursor.arraysize = chunk
+            if cursor.description is None:
+                return
+            columns = tuple(desc[0] for desc in cursor.description)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    return
+                for row in rows:
+                    yield dict(zip(columns, row))
+        finally:
+            if dedicated:
+                conn.close()
+
+    def __enter__(self):
+        """
+        with文の範囲を1トランザクションにまとめる（範囲内の操作は個別にコミットしない）。
+        正常に抜ければコミット、例外ならロールバックする。範囲の扱いは begin() を参照。
+        """
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    def begin(self):
+        """
+        トランザクションを開始する（with文と同じ範囲を明示的に開始する）。
+        ネストした場合は SAVEPOINT を使い、内側の失敗は内側だけを巻き戻す。
+        commit()/rollback() で終えるまで書き込みロックを持ち続けるため、
+        他スレッドの書き込みは範囲の終了を待つ。
+        """
+        self._write_lock.acquire()
+        try:
+            if self._tx_depth == 0:
+                if not self.conn.in_transaction:
+                    self.conn.execute("BEGIN")
+                self._tx_owner = threading.get_ident()
+            else:
+                self.conn.execute(f"SAVEPOINT sp_{self._tx_depth}")
+        except BaseException:
+            self._write_lock.release()
             raise
+        self._tx_depth += 1
+
+    def commit(self):
+        """begin() で開始した範囲（ネスト時は最も内側）をコミットする"""
+        self._end_transaction(True)
 
+    def rollback(self):
+        """begin() で開始した範囲（ネスト時は最も内側）をロールバックする"""
+        self._end_transaction(False)
+
+    def _end_transaction(self, success: bool):
+        with self._write_lock:
+            if self._tx_depth == 0:
+                # 範囲外で呼ばれた場合は、接続のコミット/ロールバックだけを行う
+                self._finish_connection(success)
+                return
+            try:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    self._tx_owner = None
+                    self._finish_connection(success)
+                else:
+                    savepoint = f"sp_{self._tx_depth}"
+                    if not success:
+                        self.conn.execute(f"ROLLBACK TO {savepoint}")
+                    self.conn.execute(f"RELEASE {savepoint}")
+            finally:
+                self._write_lock.release()  # begin() で取得した分
+
+    def _finish_connection(self, success: bool):
+        if success:
+            self.conn.commit()
+            # 範囲内で self.conn を直接使った変更もありうるため、キャッシュは全て破棄する
+            self.invalidate_query_cache()
+        else:
+            self.conn.rollback()
+
+    def _autocommit(self):
+        # with文の外で呼ばれた操作は従来どおり即時コミットする
+        if self._tx_depth == 0:
+            self.conn.commit()
+
+    @_serialized
     def create_table(self, table_name: str, columns: Dict[str, str]):
         try:
             col_defs = ", ".join([f"{col} {dtype}" for col, dtype in columns.items()])
             sql = f"CREATE TABLE IF NOT EXISTS {table_name} ({col_defs});"
             self.cursor.execute(sql)
-            self.conn.commit()
-            log.info(f"Table '{table_name}' created or verified successfully")
-        except Exception as e:
-            log.error(f"Failed to create table '{table_name}': {e}")
+            self._autocommit()
+            self.invalidate_schema(table_name)
+            self.invalidate_query_cache(table_name)
+            log.info("Table '%s' created or verified successfully", table_name)
+        except sqlite3.Error as e:
+            log.error("Failed to create table '%s': %s", table_name, e)
             raise
 
+    @_serialized
+    def create_index(
+        self, table_name: str, columns: Tuple[str, ...], unique: bool = False
+    ):
+        """
+        WHERE句・JOINで使う列にインデックスを作成する（既にあれば何もしない）。
+        名前は idx_{テーブル名}_{列名...}。"schema.table" 形式ならそのスキーマに作成する。
+        """
+        schema, _, table = table_name.rpartition(".")
+        index_name = f"idx_{table}_{'_'.join(columns)}"
+        if schema:
+            index_name = f"{schema}.{index_name}"
+        sql = (
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {index_name} "
+            f"ON {table} ({', '.join(columns)})"
+        )
+        try:
+            self.cursor.execute(sql)
+            self._autocommit()
+            log.debug("Index '%s' created or verified", index_name)
+        except sqlite3.Error as e:
+            log.error("Failed to create index on table '%s': %s", table_name, e)
+            raise
+
+    @_serialized
     def insert(self, table_name: str, data: Dict[str, Any]):
         try:
-            columns = ", ".join(data.keys())
-            placeholders = ", ".join(["?" for _ in data])
+            sql = _build_insert_sql(table_name, tuple(data))
             values = tuple(data.values())
-            sql = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
             self.cursor.execute(sql, values)
-            self.conn.commit()
+            self.invalidate_query_cache(table_name)
+            self._autocommit()
             return self.cursor.lastrowid
         except sqlite3.IntegrityError as e:
             log.warning(
-                f"Database integrity error for table '{table_name}' (duplicate or constraint violation): {e}"
+                "Database integrity error for table '%s' (duplicate or constraint violation): %s",
+                table_name,
+                e,
             )
             return None
-        except Exception as e:
-            log.error(f"Failed to insert data into table '{table_name}': {e}")
-            log.debug(f"Data to insert:")
-            for key, value in data.items():
-                log.debug(f"    Data: {key} = {value}")
-            log.debug("")
-
+        except sqlite3.Error as e:
+            log.error("Failed to insert data into table '%s': %s", table_name, e)
+            log.debug("Data to insert: %s", data)
             return None
 
-    def fetch_all(self, table_name: str) -> List[Dict[str, Any]]:
+    def bulk_insert(self, table_name: str, rows: List[Dict[str, Any]]) -> int:
+        """複数レコードを1トランザクション・1回のexecutemanyで挿入し、挿入件数を返す"""
+        if not rows:
+            return 0
+        columns = tuple(rows[0])
+        # 1つのINSERT文で流すため、全行が同じ列構成である必要がある
+        column_set = set(columns)
+        if any(row.keys() != column_set for row in rows):
+            log.error(
+                "Bulk insert into table '%s' requires all rows to share the same columns: %s",
+                table_name,
+                columns,
+            )
+            return 0
+        sql = _build_insert_sql(table_name, columns)
         try:
-            sql = f"SELECT * FROM {table_name}"
-            self.cursor.execute(sql)
-            rows = self.cursor.fetchall()
-            return [dict(row) for row in rows]
-        except Exception as e:
-            log.error(f"Failed to fetch all data from table '{table_name}': {e}")
+            with self:
+                self.cursor.executemany(
+                    sql, (tuple(row[col] for col in columns) for row in rows)
+                )
+                self.invalidate_query_cache(table_name)
+            return len(rows)
+        except sqlite3.IntegrityError as e:
+            log.warning(
+                "Database integrity error for table '%s' during bulk insert, rolled back: %s",
+                table_name,
+                e,
+            )
+            return 0
+        except sqlite3.Error as e:
+            log.error("Failed to bulk insert into table '%s': %s", table_name, e)
+            return 0
+
+    def _projection(self, table_name: str, columns: List[str] | None) -> str:
+        """
+        SELECT句の列リストを返す。列名はSQLに埋め込むため、テーブルの実際の列名と照合する。
+        """
+        if not columns:
+            return "*"
+        unknown = set(columns).difference(self.get_column_names(table_name))
+        if unknown:
+            log.error("Unknown columns for table '%s': %s", table_name, sorted(unknown))
+            raise ValueError(f"Unknown columns for table '{table_name}': {unknown}")
+        return ", ".join(columns)
+
+    def fetch_all(
+        self, table_name: str, columns: List[str] | None = None
+    ) -> List[Dict[str, Any]]:
+        try:
+            sql = _build_select_sql(table_name, self._projection(table_name, columns))
+            return self._fetch_cached(table_name, sql, ())
+        except sqlite3.Error as e:
+            log.error("Failed to fetch all data from table '%s': %s", table_name, e)
             return []
 
-    def fetch_where(
+    def iter_all(self, table_name: str, chunk: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        テーブルの全レコードを1件ずつ辞書で返す。
+        fetchmany で chunk 件ずつ取り出すため、メモリ使用量は全件数ではなく chunk に比例する。
+        """
+        return self._iter_query(_build_select_sql(table_name), (), chunk)
+
+    def iter_where(
         self, table_name: str, condition: str, params: Tuple[Any, ...]
+    ) -> Iterator[Dict[str, Any]]:
+        """条件に一致するレコードを1件ずつ辞書で返す（全件をリストに展開しない）"""
+        sql = _build_where_sql("SELECT *", table_name, condition)
+        return self._iter_query(sql, params, 1000)
+
+    def fetch_where(
+        self,
+        table_name: str,
+        condition: str,
+        params: Tuple[Any, ...],
+        columns: List[str] | None = None,
     ) -> List[Dict[str, Any]]:
         try:
-            sql = f"SELECT * FROM {table_name} WHERE {condition}"
-            self.cursor.execute(sql, params)
-            rows = self.cursor.fetchall()
-            return [dict(row) for row in rows]
-        except Exception as e:
+            projection = self._projection(table_name, columns)
+            sql = _build_where_sql(f"SELECT {projection}", table_name, condition)
+            return self._fetch_cached(table_name, sql, tuple(params))
+        except sqlite3.Error as e:
             log.error(
-                f"Failed to fetch data from table '{table_name}' with condition '{condition}': {e}"
+                "Failed to fetch data from table '%s' with condition '%s': %s",
+                table_name,
+                condition,
+                e,
             )
             return []
 
+    def _fetch_cached(
+        self, table_name: str, sql: str, params: Tuple[Any, ...]
+    ) -> List[Dict[str, Any]]:
+        """
+        SELECT結果をキャッシュ経由で返す。キャッシュには行をタプルのまま持ち、
+        返すたびに辞書を作るため、呼び出し側が辞書を書き換えてもキャッシュは壊れない。
+        トランザクション中（未コミットの変更が見える間）はキャッシュしない。
+        """
+        key = (sql, params)
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        if (
+            key is None
+            or not self._query_cache_rows
+            or self._tx_depth
+            or self.conn.in_transaction
+        ):
+            return list(_iter_dicts(self._read_conn().execute(sql, params)))
+        with self._query_cache_lock:
+            # 他の接続（別プロセス含む）がコミットすると data_version が変わるので全破棄する
+            version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._cache_data_version:
+                self._query_cache.clear()
+                self._query_cache_total = 0
+                self._cache_data_version = version
+            entry = self._query_cache.get(key)
+            if entry is not None:
+                self._query_cache.move_to_end(key)
+            generation = self._cache_generation
+        if entry is not None:
+            _, columns, rows = entry
+        else:
+            cursor = self._read_conn().cursor()
+            cursor.row_factory = None  # sqlite3.Row を作らずタプルで受け取る
+            cursor.execute(sql, params)
+            if cursor.description is None:
+                return []
+            columns = tuple(desc[0] for desc in cursor.description)
+            rows = cursor.fetchall()
+            # 1回の結果が上限を超える場合はキャッシュしない
+            if len(rows) <= self._query_cache_rows:
+                with self._query_cache_lock:
+                    if (
+                        generation == self._cache_generation
+                        and key not in self._query_cache
+                    ):
+                        self._query_cache[key] = (table_name, columns, rows)
+                        self._query_cache_total += len(rows)
+                        while self._query_cache_total > self._query_cache_rows:
+                            _, (_, _, evicted) = self._query_cache.popitem(last=False)
+                            self._query_cache_total -= len(evicted)
+        return [dict(zip(columns, row)) for row in rows]
+
+    def invalidate_query_cache(self, table_name: str | None = None):
+        """テーブルに関係するSELECT結果のキャッシュを破棄する。Noneなら全件。"""
+        with self._query_cache_lock:
+            self._cache_generation += 1
+            if table_name is None:
+                self._query_cache.clear()
+                self._query_cache_total = 0
+                return
+            for key in [k for k, v in self._query_cache.items() if v[0] == table_name]:
+                self._query_cache_total -= len(self._query_cache.pop(key)[2])
+
+    def scalar(self, sql: str, params: Tuple[Any, ...] = ()) -> Any:
+        """SQLを実行し、先頭行の先頭列の値だけを返す（行がなければNone）"""
+        row = self._read_conn().execute(sql, params).fetchone()
+        return row[0] if row else None
+
+    def count(
+        self, table_name: str, condition: str = "", params: Tuple[Any, ...] = ()
+    ) -> int:
+        """条件に一致するレコード数を返す。行をPython側に取り出さず COUNT(1) で数える。"""
+        try:
+            if condition:
+                sql = _build_where_sql("SELECT COUNT(1)", table_name, condition)
+            else:
+                sql = f"SELECT COUNT(1) FROM {table_name}"
+            return self.scalar(sql, params)
+        except sqlite3.Error as e:
+            log.error("Failed to count rows in table '%s': %s", table_name, e)
+            return 0
+
+    def exists(self, table_name: str, condition: str, params: Tuple[Any, ...]) -> bool:
+        """条件に一致するレコードが1件でもあるかを返す（最初の1行で走査を打ち切る）"""
+        try:
+            sql = _build_where_sql("SELECT 1", table_name, condition) + " LIMIT 1"
+            return self.scalar(sql, params) is not None
+        except sqlite3.Error as e:
+            log.error(
+                "Failed to check existence in table '%s' with condition '%s': %s",
+                table_name,
+                condition,
+                e,
+            )
+            return False
+
+    @_serialized
     def update(
         self,
         table_name: str,
@@ -83,32 +567,228 @@ class SQLiteManager(DBManagerInterface):
         params: Tuple[Any, ...],
     ):
         try:
-            set_clause = ", ".join([f"{col} = ?" for col in updates])
-            values = list(updates.values()) + list(params)
-            sql = f"UPDATE {table_name} SET {set_clause} WHERE {condition}"
+            sql = _build_update_sql(table_name, tuple(updates), condition)
+            values = (*updates.values(), *params)
             self.cursor.execute(sql, values)
-            self.conn.commit()
-        except Exception as e:
+            self.invalidate_query_cache(table_name)
+            self._autocommit()
+        except sqlite3.Error as e:
+            log.error(
+                "Failed to update table '%s' with condition '%s': %s",
+                table_name,
+                condition,
+                e,
+            )
+            raise
+
+    def update_many(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        key_columns: Tuple[str, ...],
+    ) -> int:
+        """
+        複数レコードを1回のexecutemanyで更新し、更新件数を返す。
+        各行は更新する列とキー列の両方を含み、全行で更新する列の構成が同じである必要がある。
+        例: update_many("tasks", [{"id": 1, "status": "done"}, ...], ("id",))
+        """
+        if not rows:
+            return 0
+        key_columns = tuple(key_columns)
+        columns = tuple(col for col in rows[0] if col not in key_columns)
+        # 1つのUPDATE文で流すため、全行が同じ列構成（キー列を含む）である必要がある
+        column_set = set(rows[0])
+        if not column_set.issuperset(key_columns) or any(
+            row.keys() != column_set for row in rows
+        ):
             log.error(
-                f"Failed to update table '{table_name}' with condition '{condition}': {e}"
+                "Update many on table '%s' requires all rows to share the same columns including keys %s: %s",
+                table_name,
+                key_columns,
+                tuple(rows[0]),
             )
+            return 0
+        condition = " AND ".join(f"{col} = ?" for col in key_columns)
+        try:
+            sql = _build_update_sql(table_name, columns, condition)
+            with self:
+                self.cursor.executemany(
+                    sql,
+                    (
+                        (*(row[col] for col in columns), *(row[k] for k in key_columns))
+                        for row in rows
+                    ),
+                )
+                self.invalidate_query_cache(table_name)
+                # 書き込みロックを手放すと他スレッドの書き込みで rowcount が変わりうる
+                updated = self.cursor.rowcount
+            return updated
+        except sqlite3.Error as e:
+            log.error("Failed to update many rows in table '%s': %s", table_name, e)
             raise
 
+    def prepared_update(
+        self, table_name: str, columns: Tuple[str, ...], condition: str
+    ) -> Callable[[Tuple[Any, ...], Tuple[Any, ...]], None]:
+        """
+        同じ形のUPDATEを繰り返し実行するための関数を返す。
+        SQLは1度だけ組み立て、呼び出しごとにパラメータだけをバインドする。
+        update と同様に with文の外では呼び出しごとにコミットするため、
+        繰り返す場合は `with db:` で囲んで1回のコミットにまとめる。
+        """
+        sql = _build_update_sql(table_name, tuple(columns), condition)
+        cursor = self.conn.cursor()
+
+        def run(values: Tuple[Any, ...], params: Tuple[Any, ...]):
+            with self._write_lock:
+                cursor.execute(sql, (*values, *params))
+                self.invalidate_query_cache(table_name)
+                self._autocommit()
+
+        return run
+
+    @_serialized
     def delete(self, table_name: str, condition: str, params: Tuple[Any, ...]):
         try:
-            sql = f"DELETE FROM {table_name} WHERE {condition}"
+            sql = _build_where_sql("DELETE", table_name, condition)
             self.cursor.execute(sql, params)
-            self.conn.commit()
-        except Exception as e:
+            self.invalidate_query_cache(table_name)
+            self._autocommit()
+        except sqlite3.Error as e:
+            log.error(
+                "Failed to delete from table '%s' with condition '%s': %s",
+                table_name,
+                condition,
+                e,
+            )
+            raise
+
+    def delete_many(
+        self, table_name: str, condition: str, params_list: List[Tuple[Any, ...]]
+    ) -> int:
+        """
+        同じ条件式で複数回の削除を1回のexecutemanyで行い、削除件数を返す。
+        例: delete_many("tasks", "id = ?", [(1,), (2,), (3,)])
+        """
+        if not params_list:
+            return 0
+        try:
+            sql = _build_where_sql("DELETE", table_name, condition)
+            with self:
+                self.cursor.executemany(sql, params_list)
+                self.invalidate_query_cache(table_name)
+                # 書き込みロックを手放すと他スレッドの書き込みで rowcount が変わりうる
+                deleted = self.cursor.rowcount
+            return deleted
+        except sqlite3.Error as e:
             log.error(
-                f"Failed to delete from table '{table_name}' with condition '{condition}': {e}"
+                "Failed to delete many rows from table '%s' with condition '%s': %s",
+                table_name,
+                condition,
+                e,
             )
             raise
 
+    def get_table_schema(self, table_name: str) -> List[Dict[str, Any]]:
+        # スキーマは接続中ほぼ不変なので、PRAGMAの結果をテーブル単位でキャッシュする
+        cached = self._schema_cache.get(table_name)
+        if cached is not None:
+            return cached
+        try:
+            # 共有の self.cursor は他スレッドの書き込みで再実行されうるため、専用カーソルを使う
+            schema = list(
+                _iter_dicts(self.conn.execute(f"PRAGMA table_info({table_name})"))
+            )
+        except sqlite3.Error as e:
+            log.error("Failed to get schema of table '%s': %s", table_name, e)
+            return []
+        # 存在しないテーブル（空の結果）はキャッシュしない
+        if schema:
+            self._schema_cache[table_name] = schema
+        return schema
+
+    def get_column_names(self, table_name: str) -> List[str]:
+        cached = self._column_cache.get(table_name)
+        if cached is not None:
+            return cached
+        try:
+            # 列名だけが必要なので辞書化せず、PRAGMA table_info の name(1列目) を直接取り出す
+            names = [
+                row[1]
+                for row in self.execute_raw_rows(f"PRAGMA table_info({table_name})")
+            ]
+        except sqlite3.Error as e:
+            log.error("Failed to get column names of table '%s': %s", table_name, e)
+            return []
+        if names:
+            self._column_cache[table_name] = names
+        return names
+
+    def invalidate_schema(self, table_name: str | None = None):
+        """スキーマキャッシュを破棄する（DDL実行後用）。Noneなら全テーブル。"""
+        if table_name is None:
+            self._schema_cache.clear()
+            self._column_cache.clear()
+        else:
+            self._schema_cache.pop(table_name, None)
+            self._column_cache.pop(table_name, None)
+
+    @_serialized
+    def incremental_vacuum(self, pages: int = 0):
+        """
+        削除で空いたページをファイルから回収する（auto_vacuum=INCREMENTAL のDB用）。
+        pages: 回収するページ数。0なら空きページをすべて回収する。
+        トランザクション（with文）の外で呼ぶこと。
+        """
+        if self._tx_depth:
+            log.warning("incremental_vacuum skipped: called inside a transaction")
+            return
+        try:
+            # cursor.execute では1ステップ(1ページ)しか進まないため、最後まで実行される executescript を使う
+            self.conn.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+        except sqlite3.Error as e:
+            log.error("Failed to run incremental vacuum on %s: %s", self.db_path, e)
+            raise
+
+    @_serialized
+    def execute_raw_rows(
+        self, sql: str, params: Tuple[Any, ...] = ()
+    ) -> Iterator[sqlite3.Row]:
+        """
+        任意のSQLを実行し、sqlite3.Row をそのまま返すイテレータを返す（辞書化しない）。
+        SELECT/PRAGMA以外は他の書き込みと同様に、with文の外なら即時コミットする。
+        どのテーブルを変更したか分からないため、実行後にクエリキャッシュを全て破棄する。
+        """
+        cursor = self.conn.execute(sql, params)
+        if sql.lstrip()[:6].upper() not in ("SELECT", "PRAGMA"):
+            self._autocommit()
+            self.invalidate_query_cache()
+        return cursor
+
+    @_serialized
+    def attach_scratch(self, schema_name: str = "scratch") -> str:
+        """
+        メモリ上のデータベースを schema_name として ATTACH する（作業用領域）。
+        大量の一時データは `scratch.テーブル名` に書き込み、最後に
+        `INSERT INTO main.テーブル名 SELECT * FROM scratch.テーブル名` で1回だけ本体へ反映する。
+        すでにATTACH済みなら何もしない。
+        """
+        attached = {row[1] for row in self.execute_raw_rows("PRAGMA database_list")}
+        if schema_name not in attached:
+            self.conn.execute(f"ATTACH DATABASE ':memory:' AS {schema_name}")
+            # 読み取り専用接続からは見えないため、以降の読み取りも self.conn で行う
+            self._use_readers = False
+            log.info("Attached in-memory scratch database as '%s'", schema_name)
+        return schema_name
+
     def close(self):
         try:
+            with self._readers_lock:
+                for reader in self._readers:
+                    reader.close()
+                self._readers.clear()
             if self.conn:
                 self.conn.close()
-                log.info(f"SQLite database connection closed: {self.db_path}")
-        except Exception as e:
-            log.error(f"Error closing SQLite database connection: {e}")
+                log.info("SQLite database connection closed: %s", self.db_path)
+        except sqlite3.Error as e:
+            log.error("Error closing SQLite database connection: %s", e)
@@ -1,128 +1,263 @@
 from pathlib import Path
+import os
 import sys
 import re
 import argparse
-import time
-from typing import List, Tuple, Optional
+import fnmatch
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
+
+# 直下のサブディレクトリがこの数を超える場合だけ、サイズ集計をスレッドで並列化する
+PARALLEL_SCAN_THRESHOLD = 4
+
+# format_size の単位（1024 倍ごと）
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# fdを渡した scandir（*at 系 syscall）が使えるか。Windows では使えないのでパス指定に戻す
+SCANDIR_AT = os.scandir in os.supports_fd and hasattr(os, "O_DIRECTORY")
+
+
+# ディレクトリエントリの種別
+KIND_DIR, KIND_FILE, KIND_OTHER = 0, 1, 2
+
+
+def classify_entry(entry: os.DirEntry) -> int:
+    """エントリの種別を返す（シンボリックリンクはリンク先で判定）
+
+    is_dir / is_file を使う箇所ごとに呼ぶ代わりに、1回だけ判定して使い回す
+    """
+    if entry.is_dir():
+        return KIND_DIR
+    if entry.is_file():
+        return KIND_FILE
+    return KIND_OTHER
 
 
 class FileUtils:
     """File and directory utility functions"""
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def format_size(size_bytes: int) -> str:
-        """バイト数を人間が読みやすい形式に変換"""
-        if size_bytes == 0:
-            return "0B"
-        
-        units = ['B', 'KB', 'MB', 'GB', 'TB']
-        size = float(size_bytes)
-        unit_index = 0
-        
-        while size >= 1024 and unit_index < len(units) - 1:
-            size /= 1024
-            unit_index += 1
-        
-        if unit_index == 0:
-            return f"{int(size)}B"
-        else:
-            return f"{size:.1f}{units[unit_index]}"
+        """バイト数を人間が読みやすい形式に変換（同じサイズが多いので結果をキャッシュ）"""
+        if size_bytes < 1024:
+            return f"{size_bytes}B"
+        
+        # 1024 = 2^10 なので単位は bit_length から直接求まる（割り算のループは不要）
+        unit_index = min((size_bytes.bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        size = size_bytes / (1 << (unit_index * 10))
+        return f"{size:.1f}{SIZE_UNITS[unit_index]}"
     
     @staticmethod
-    def get_file_size(path: Path) -> int:
-        """ファイルサイズを取得"""
+    def get_file_size(path) -> int:
+        """ファイルサイズを取得（Path / DirEntry のどちらも可。DirEntry なら stat 結果を再利用）
+
+        du と同様にシンボリックリンクはたどらず、リンク自体のサイズを返す
+        """
         try:
-            return path.stat().st_size
+            if isinstance(path, os.DirEntry):
+                return path.stat(follow_symlinks=False).st_size
+            return path.lstat().st_size
         except (OSError, PermissionError):
             return 0
     
     @staticmethod
-    def get_directory_size(path: Path, progress_bar: Optional['ProgressBar'] = None) -> int:
-        """ディレクトリ内のすべてのファイルサイズの合計を取得"""
-        total_size = 0
+    def _entry_size(entry: os.DirEntry, links: Dict[Tuple[int, int], List[int]]) -> int:
+        """エントリのサイズ（lstat）
+
+        ハードリンクされたファイル（st_nlink > 1）は、links に (st_dev, st_ino) ごとの
+        [サイズ, 出現数] を記録する。各ディレクトリのサイズにはそのまま足し、
+        重複分は最後に合計からだけ差し引く（走査順やスレッドで各ディレクトリの値が変わらない）
+        """
         try:
-            for item in path.rglob('*'):
-                if item.is_file():
-                    try:
-                        total_size += item.stat().st_size
-                        if progress_bar:
-                            progress_bar.update(1)
-                    except (OSError, PermissionError):
-                        if progress_bar:
-                            progress_bar.update(1)
+            st = entry.stat(follow_symlinks=False)
         except (OSError, PermissionError):
-            pass
-        return total_size
+            return 0
+        if st.st_nlink > 1:
+            record = links.get((st.st_dev, st.st_ino))
+            if record is None:
+                links[(st.st_dev, st.st_ino)] = [st.st_size, 1]
+            else:
+                record[1] += 1
+        return st.st_size
     
     @staticmethod
-    def count_files_in_directory(path: Path) -> int:
-        """ディレクトリ内のファイル総数をカウント（プログレスバー用）"""
-        count = 0
-        print("file count: ", end="", flush=True)
-        try:
-            for item in path.rglob('*'):
-                if item.is_file():
-                    count += 1
-                    if count % 100 == 0:  # 100ファイルごとに更新
-                        print(f"\rfile count: {count}", end="", flush=True)
-        except (OSError, PermissionError):
-            pass
-        print(f"\rfile count: {count}")  # 最終結果を改行付きで表示
-        return count
-
-
-class ProgressBar:
-    """シンプルなプログレスバー"""
-    
-    def __init__(self, total: int, prefix: str = "Processing", width: int = 40):
-        self.total = total
-        self.current = 0
-        self.prefix = prefix
-        self.width = width
-        self.start_time = time.time()
-        self.finished = False
-
-    def update(self, increment: int = 1):
-        """プログレスを更新"""
-        if self.finished:
-            return  # すでに終了していれば何もしない
-        self.current += increment
-        if self.current >= self.total:
-            self.current = self.total
-            self._print_progress()
-            self.finished = True
-        else:
-            self._print_progress()
+    def _duplicate_link_bytes(*links: Dict[Tuple[int, int], List[int]]) -> int:
+        """走査ごとのハードリンク記録をまとめ、2つ目以降のリンクで重複して数えたバイト数を返す"""
+        merged: Dict[Tuple[int, int], List[int]] = {}
+        for records in links:
+            for key, (size, seen) in records.items():
+                record = merged.setdefault(key, [size, 0])
+                record[1] += seen
+        return sum(size * (seen - 1) for size, seen in merged.values())
+    
+    @staticmethod
+    def iter_files(path: Path, exclude: Optional[Callable[[str], bool]] = None):
+        """ディレクトリ以下のファイルの DirEntry を再帰的に返す
 
-    def _print_progress(self):
-        """プログレスバーを表示"""
-        if self.total == 0 or self.finished:
-            return
+        Path.rglob と違い Path オブジェクトを作らず、os.scandir の d_type で
+        種別を判定するため、ファイル種別の確認に stat を発行しない。
+        exclude: 名前を受け取り True を返したエントリ（ディレクトリなら配下ごと）を飛ばす
+        """
+        stack = [str(path)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if exclude is not None and exclude(entry.name):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+            except (OSError, PermissionError):
+                continue
+    
+    @staticmethod
+    def get_directory_size(path: Path, exclude: Optional[Callable[[str], bool]] = None) -> int:
+        """ディレクトリ内のすべてのファイルサイズの合計を取得"""
+        total_size = 0
+        links: Dict[Tuple[int, int], List[int]] = {}
+        for entry in FileUtils.iter_files(path, exclude):
+            total_size += FileUtils._entry_size(entry, links)
+        return total_size - FileUtils._duplicate_link_bytes(links)
+    
+    @staticmethod
+    def _scan_sizes(root: str, on_files=None,
+                    links: Optional[Dict[Tuple[int, int], List[int]]] = None,
+                    exclude: Optional[Callable[[str], bool]] = None) -> Dict[str, List[int]]:
+        """root 以下の各ディレクトリの [合計サイズ, ファイル数] を1回の走査で集計
 
-        percent = min(100, (self.current / self.total) * 100)
-        filled = int(self.width * self.current // self.total)
-        bar = '█' * filled + '-' * (self.width - filled)
+        on_files: ディレクトリを1つ読むごとに、その直下のファイル数を渡して呼ばれる
+        links: ハードリンクの記録先（_entry_size を参照）。スレッドごとに別の辞書を渡す
+        exclude: 名前が一致したエントリを集計から除く（ディレクトリなら配下ごと）
+        """
+        if links is None:
+            links = {}
+        totals: Dict[str, List[int]] = {}
+        parents: Dict[str, str] = {}
+        order = []  # 訪問順（親が子より先）。逆順にたどると子→親の順で集計できる
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            order.append(current)
+            size = files = 0
+            fd = None
+            try:
+                # 開いたディレクトリのfdから scandir すると、DirEntry.stat() が
+                # fstatat(dir_fd, 名前) になり、毎回ルートからパスを解決し直さずに済む
+                if SCANDIR_AT:
+                    fd = os.open(current, os.O_RDONLY | os.O_DIRECTORY)
+                with os.scandir(current if fd is None else fd) as it:
+                    for entry in it:
+                        if exclude is not None and exclude(entry.name):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            child = os.path.join(current, entry.name)
+                            parents[child] = current
+                            stack.append(child)
+                        elif entry.is_file():
+                            files += 1
+                            size += FileUtils._entry_size(entry, links)
+            except (OSError, PermissionError):
+                pass
+            finally:
+                if fd is not None:
+                    os.close(fd)
+            totals[current] = [size, files]
+            if on_files:
+                on_files(files)
+        
+        for directory in reversed(order):
+            parent = parents.get(directory)
+            if parent is not None:
+                totals[parent][0] += totals[directory][0]
+                totals[parent][1] += totals[directory][1]
+        return totals
+    
+    @staticmethod
+    def scan_directory_sizes(path: Path, workers: int = 1,
+                             exclude: Optional[Callable[[str], bool]] = None) -> Dict[str, Tuple[int, int]]:
+        """配下の全ディレクトリの (合計サイズ, ファイル数) を1回の走査でまとめて取得
 
-        elapsed = time.time() - self.start_time
-        if self.current > 0:
-            eta = (elapsed / self.current) * (self.total - self.current)
-            eta_str = f"ETA: {eta:.1f}s"
+        ディレクトリごとに get_directory_size で部分木を歩き直すと O(D·N) になるため、
+        各ディレクトリ直下の集計を1回だけ行い、最後に子から親へ足し上げる。
+        workers > 1 でサブディレクトリが十分多い場合は、直下のサブディレクトリごとに
+        スレッドで並列に走査する（stat はGILを解放するため、I/O待ちが重なる）
+        exclude: 名前が一致したエントリを集計から除く（--exclude）
+        """
+        root = str(path)
+        lock = threading.Lock()
+        count = 0
+        
+        def on_files(files: int):
+            nonlocal count
+            with lock:
+                if count // 100 != (count + files) // 100:  # 100ファイルごとに更新
+                    print(f"\rfile count: {count + files}", end="", flush=True)
+                count += files
+        
+        print("file count: ", end="", flush=True)
+        subdirs = []
+        if workers > 1:
+            try:
+                with os.scandir(root) as it:
+                    subdirs = [e.path for e in it if e.is_dir(follow_symlinks=False)
+                               and not (exclude is not None and exclude(e.name))]
+            except (OSError, PermissionError):
+                subdirs = []
+        
+        # サブディレクトリが少ないとスレッドの起動コストの方が大きいので逐次で走査する
+        links: Dict[Tuple[int, int], List[int]] = {}
+        link_records = [links]
+        if len(subdirs) <= PARALLEL_SCAN_THRESHOLD:
+            totals = FileUtils._scan_sizes(root, on_files, links, exclude)
         else:
-            eta_str = "ETA: --s"
-
-        print(f'\r{self.prefix}: |{bar}| {percent:.1f}% ({self.current}/{self.total}) {eta_str}', end='', flush=True)
-
-        if self.current >= self.total:
-            print()  # 改行
+            size = files = 0
+            try:
+                with os.scandir(root) as it:
+                    for entry in it:
+                        if exclude is not None and exclude(entry.name):
+                            continue
+                        if not entry.is_dir(follow_symlinks=False) and entry.is_file():
+                            files += 1
+                            size += FileUtils._entry_size(entry, links)
+            except (OSError, PermissionError):
+                pass
+            on_files(files)
+            totals = {root: [size, files]}
+            
+            def scan_subdir(subdir: str):
+                sub_links: Dict[Tuple[int, int], List[int]] = {}
+                link_records.append(sub_links)
+                return FileUtils._scan_sizes(subdir, on_files, sub_links, exclude)
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for subdir, sub_totals in zip(subdirs, executor.map(scan_subdir, subdirs)):
+                    totals.update(sub_totals)
+                    totals[root][0] += sub_totals[subdir][0]
+                    totals[root][1] += sub_totals[subdir][1]
+        # ハードリンクの重複分はルートの合計からだけ差し引く
+        totals[root][0] -= FileUtils._duplicate_link_bytes(*link_records)
+        print(f"\rfile count: {count}")  # 最終結果を改行付きで表示
+        return {directory: (size, files) for directory, (size, files) in totals.items()}
 
 
 class TreeOptions:
     """Tree generation options"""
     
+    __slots__ = ('path', 'max_files', 'show_size', 'align_size', 'include_hidden',
+                 'output_file', 'do_save', 'do_print', 'exclude_patterns',
+                 '_exclude_re', 'stat_threads')
+    
     def __init__(self, path: Path, max_files: int = 10, show_size: bool = True, 
                  align_size: bool = False, include_hidden: bool = False,
                  output_file: Optional[str] = None, do_save: bool = True, 
-                 do_print: bool = True, exclude_patterns: Optional[List[str]] = None):
+                 do_print: bool = True, exclude_patterns: Optional[List[str]] = None,
+                 stat_threads: int = 8):
         self.path = path
         self.max_files = max_files
         self.show_size = show_size
@@ -132,6 +267,16 @@ class TreeOptions:
         self.do_save = do_save
         self.do_print = do_print
         self.exclude_patterns = exclude_patterns or []
+        # 除外パターンは1つの正規表現にまとめておき、エントリごとに1回の match で判定する
+        self._exclude_re = (
+            re.compile("|".join(fnmatch.translate(p) for p in self.exclude_patterns))
+            if self.exclude_patterns else None
+        )
+        self.stat_threads = stat_threads
+    
+    def is_excluded(self, name: str) -> bool:
+        """名前が除外パターン（--exclude）のいずれかに一致するか"""
+        return self._exclude_re is not None and self._exclude_re.match(name) is not None
     
     def validate(self) -> bool:
         """オプションの妥当性をチェック"""
@@ -143,6 +288,10 @@ class TreeOptions:
             print("エラー: --max-files は1以上である必要があります")
             return False
         
+        if self.stat_threads < 1:
+            print("エラー: --stat-threads は1以上である必要があります")
+            return False
+        
         if not self.do_save and not self.do_print:
             print("警告: 保存も表示も無効のため、何も実行されません")
             return False
@@ -153,114 +302,72 @@ class TreeOptions:
 class DirectoryTreeGenerator:
     """Directory tree generation logic"""
     
+    __slots__ = ('options', 'file_utils')
+    
     def __init__(self, options: TreeOptions):
         self.options = options
         self.file_utils = FileUtils()
     
-    def should_include_entry(self, entry: Path) -> bool:
+    def size_exclude(self) -> Optional[Callable[[str], bool]]:
+        """サイズ集計に渡す除外判定（--exclude の指定がなければ None）"""
+        return self.options.is_excluded if self.options.exclude_patterns else None
+    
+    def list_dir(self, path: Path) -> Optional[List[os.DirEntry]]:
+        """ディレクトリの DirEntry 一覧を返す（読めない場合は None）
+
+        各ディレクトリはツリー生成中に1回しか読まないのでキャッシュしない
+        （一覧を保持し続けるとストリーミング出力でもメモリが減らない）
+        """
+        try:
+            with os.scandir(str(path)) as it:
+                return list(it)
+        except (OSError, PermissionError):
+            return None
+    
+    def should_include_entry(self, entry) -> bool:
         """エントリを含めるべきかチェック"""
         return self.should_include_directory(entry) if entry.is_dir() else True
     
-    def should_include_directory(self, dir_path: Path) -> bool:
+    def should_include_directory(self, dir_path) -> bool:
         """ディレクトリが対象であるかを確認する"""
         # --hiddenオプションが有効な場合は常にTrue
-        if self.options.include_hidden:
-            return True
-        
-        # 隠しディレクトリ・特殊ディレクトリをチェック
-        name = dir_path.name
-        
-        # . で始まる隠しディレクトリ
-        if name.startswith('.'):
-            return False
-        
-        # __ で始まる特殊ディレクトリ（__pycache__等）
-        if name.startswith('__'):
-            return False
-        
-        # _ で始まるディレクトリ
-        if name.startswith('_'):
-            return False
-        
-        return True
+        # それ以外は . で始まる隠しディレクトリと _ / __ で始まる特殊ディレクトリ（__pycache__等）を除外
+        # （__ も _ で始まるので、先頭1文字の判定1回で済む）
+        return self.options.include_hidden or dir_path.name[:1] not in ('.', '_')
     
-    def calculate_max_name_length(self, path: Path, prefix: str = "", 
-                                 depth: int = 0, max_depth: int = 3) -> int:
-        """ツリー表示で必要な最大の名前長を計算（深い階層は制限）"""
-        max_length = len(prefix) + len(path.name)
-        
-        if depth >= max_depth:
-            return max_length
-        
-        try:
-            entries = list(path.iterdir())
-        except (OSError, PermissionError):
-            return max_length
-        
-        # フィルタリング
-        filtered_entries = [e for e in entries if self.should_include_entry(e)]
-        
-        # ファイル数制限の適用
-        if len(filtered_entries) > self.options.max_files:
-            dirs = [e for e in filtered_entries if e.is_dir()]
-            files = [e for e in filtered_entries if e.is_file()]
-            
-            if len(dirs) <= self.options.max_files:
-                remaining_slots = self.options.max_files - len(dirs)
-                selected_entries = dirs + files[:remaining_slots]
-            else:
-                selected_entries = dirs[:self.options.max_files]
-            
-            filtered_entries = selected_entries
-        
-        sorted_entries = sorted(filtered_entries, key=lambda x: (not x.is_dir(), x.name.lower()))
-        
-        for idx, entry in enumerate(sorted_entries):
-            is_last = (idx == len(sorted_entries) - 1)
-            connector = "└── " if is_last else "├── "
-            current_prefix = prefix + connector
-            current_length = len(current_prefix) + len(entry.name)
-            max_length = max(max_length, current_length)
-            
-            if entry.is_dir():
-                extension = "    " if is_last else "│   "
-                child_length = self.calculate_max_name_length(
-                    entry, prefix + extension, depth + 1, max_depth
-                )
-                max_length = max(max_length, child_length)
-        
-        return max_length
-    
-    def make_tree_lines(self, path: Path, prefix: str = "", 
-                       align_width: Optional[int] = None, 
-                       progress_bar: Optional[ProgressBar] = None, 
-                       is_root: bool = False) -> List[str]:
-        """ディレクトリツリーを1行ずつリストで返す"""
-        lines = []
-        
-        try:
-            entries = list(path.iterdir())
-        except (OSError, PermissionError):
-            line = prefix + "├── [Permission Denied]"
-            if self.options.show_size and align_width:
-                line = line.ljust(align_width) + " [N/A]"
-            return [line]
+    def iter_tree_rows(self, path: Path, prefix: str = "", 
+                       is_root: bool = False,
+                       size_cache: Optional[Dict[str, Tuple[int, int]]] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        """ディレクトリツリーを (名前部分, サイズ部分) の行として1行ずつ返す
+
+        サイズ部分はサイズ非表示なら ""、省略行など幅揃えの対象外の行は None。
+        幅揃えは全行がそろってから行うため、ここでは名前部分をパディングしない
+        size_cache: scan_directory_sizes の結果。あればディレクトリサイズをここから引く
+        """
+        entries = self.list_dir(path)
+        if entries is None:
+            yield (prefix + "├── [Permission Denied]", None)
+            return
         
         # 全てのエントリを取得（ファイルは従来通り、ディレクトリは表示するが中身を制御）
+        # 種別は1エントリにつき1回だけ判定し、以降は (種別, エントリ) の組で扱う
         all_entries = []
         for entry in entries:
-            if entry.is_file():
+            if self.options.is_excluded(entry.name):
+                continue
+            kind = classify_entry(entry)
+            if kind == KIND_FILE:
                 # ファイルは従来の判定
                 if self.should_include_entry(entry):
-                    all_entries.append(entry)
+                    all_entries.append((kind, entry))
             else:
                 # ディレクトリは常に表示対象に含める
-                all_entries.append(entry)
+                all_entries.append((kind, entry))
         
         # ファイル数が制限を超える場合は制限する（ただし、ルートディレクトリは制限しない）
         if not is_root and len(all_entries) > self.options.max_files:
-            dirs = [e for e in all_entries if e.is_dir()]
-            files = [e for e in all_entries if e.is_file()]
+            dirs = [item for item in all_entries if item[0] == KIND_DIR]
+            files = [item for item in all_entries if item[0] == KIND_FILE]
             
             if len(dirs) <= self.options.max_files:
                 remaining_slots = self.options.max_files - len(dirs)
@@ -276,90 +383,129 @@ class DirectoryTreeGenerator:
             omitted_count = 0
         
         # ソート（ディレクトリ優先、その後名前順）
-        sorted_entries = sorted(filtered_entries, key=lambda x: (not x.is_dir(), x.name.lower()))
+        # キーは1エントリにつき1回だけ作り、比較は itemgetter で行う（lambda呼び出しをなくす）
+        keyed_entries = [(kind != KIND_DIR, e.name.lower(), kind, e) for kind, e in filtered_entries]
+        keyed_entries.sort(key=itemgetter(0, 1))
+        sorted_entries = [(item[2], item[3]) for item in keyed_entries]
         
-        for idx, entry in enumerate(sorted_entries):
+        for idx, (kind, entry) in enumerate(sorted_entries):
+            is_dir = kind == KIND_DIR
             is_last = (idx == len(sorted_entries) - 1) and (omitted_count == 0)
             connector = "└── " if is_last else "├── "
             
             line = prefix + connector + entry.name
+            size_str = ""
             
             # サイズ情報を追加
             if self.options.show_size:
-                if entry.is_dir():
-                    # 全ディレクトリのサイズを計算
-                    size = self.file_utils.get_directory_size(entry, progress_bar)
+                if is_dir:
+                    # 事前集計があればそれを使い、なければ（シンボリックリンク先など）その場で計算
+                    cached = size_cache.get(entry.path) if size_cache else None
+                    if cached is not None:
+                        size = cached[0]
+                    else:
+                        size = self.file_utils.get_directory_size(
+                            Path(entry.path), self.size_exclude()
+                        )
                 else:
                     size = self.file_utils.get_file_size(entry)
-                    if progress_bar:
-                        progress_bar.update(1)
                 
                 size_str = f" [{self.file_utils.format_size(size)}]"
-                
-                if align_width:
-                    line = line.ljust(align_width) + size_str
-                else:
-                    line += size_str
             
-            lines.append(line)
+            yield (line, size_str)
             
             # ディレクトリの場合、対象ディレクトリのみ中身を展開
-            if entry.is_dir() and self.should_include_directory(entry):
+            if is_dir and self.should_include_directory(entry):
                 extension = "    " if is_last and omitted_count == 0 else "│   "
-                lines.extend(self.make_tree_lines(
-                    entry, prefix + extension, align_width, progress_bar, False
-                ))
+                yield from self.iter_tree_rows(
+                    Path(entry.path), prefix + extension, False, size_cache
+                )
         
         # 省略されたファイルがある場合の表示
         if omitted_count > 0:
-            line = prefix + f"└── ... and {omitted_count} more items"
+            yield (prefix + f"└── ... and {omitted_count} more items", None)
+    
+    def make_tree_rows(self, path: Path, prefix: str = "", 
+                       is_root: bool = False,
+                       size_cache: Optional[Dict[str, Tuple[int, int]]] = None) -> List[Tuple[str, Optional[str]]]:
+        """iter_tree_rows の結果をリストで返す"""
+        return list(self.iter_tree_rows(path, prefix, is_root, size_cache))
+    
+    def format_row(self, line: str, size_str: Optional[str], 
+                   align_width: Optional[int] = None) -> str:
+        """(名前部分, サイズ部分) の行を、必要なら幅を揃えて1つの文字列にする"""
+        if size_str is None:
             if self.options.show_size and align_width:
                 line = line.ljust(align_width) + " [N/A]"
-            lines.append(line)
-        
-        return lines
+        elif size_str and align_width:
+            line = line.ljust(align_width) + size_str
+        else:
+            line += size_str
+        return line
     
-    def generate_tree_lines(self) -> Tuple[str, List[str]]:
-        """ツリーを生成して（ルート行, 子行のリスト）を返す"""
+    def format_rows(self, rows: List[Tuple[str, Optional[str]]], 
+                    align_width: Optional[int] = None) -> List[str]:
+        """make_tree_rows の行を、必要なら幅を揃えて文字列にする"""
+        return [self.format_row(line, size_str, align_width) for line, size_str in rows]
+    
+    def make_tree_lines(self, path: Path, prefix: str = "", 
+                       align_width: Optional[int] = None, 
+                       is_root: bool = False,
+                       size_cache: Optional[Dict[str, Tuple[int, int]]] = None) -> List[str]:
+        """ディレクトリツリーを1行ずつリストで返す"""
+        rows = self.make_tree_rows(path, prefix, is_root, size_cache)
+        return self.format_rows(rows, align_width)
+    
+    def iter_tree_lines(self) -> Iterator[str]:
+        """ツリーを1行ずつ返す（最初の1行がルート行）
+
+        幅揃えなしの場合は行を溜めずに生成しながら返すので、大きなツリーでも
+        全行のリストや連結した巨大な文字列を作らずに出力できる
+        """
         path = self.options.path
         
-        # プログレスバーの初期化（サイズ計算時のみ）
-        progress_bar = None
-        if self.options.show_size:
-            total_files = self.file_utils.count_files_in_directory(path)
-            if total_files > 0:
-                progress_bar = ProgressBar(total_files, "サイズ計算中")
+        # サイズ計算時は、全ディレクトリのサイズとファイル数を1回の走査で集計しておく。
+        # 総ファイル数は走査が終わるまで分からないため「サイズ計算中」の％表示は出さず、
+        # 走査中の進捗は scan_directory_sizes の "file count" 表示（件数のみ）で示す
+        size_cache = None
+        if self.options.show_size and path.is_dir():
+            size_cache = self.file_utils.scan_directory_sizes(
+                path, self.options.stat_threads, self.size_exclude()
+            )
+        
+        # ツリーの生成（幅揃えの幅は、生成した行から求めるので事前の走査は不要）
+        rows = self.iter_tree_rows(path, is_root=True, size_cache=size_cache)
+        align_width = None
+        if self.options.align_size:
+            # 幅を決めるには全行が必要なので、この場合だけリストにする
+            rows = list(rows)
+            align_width = max(
+                [len(path.name)] + [len(line) for line, size_str in rows if size_str is not None]
+            )
         
         # ルートの処理
         root_line = path.name
         if self.options.show_size:
-            if path.is_dir():
-                total_size = self.file_utils.get_directory_size(path, progress_bar)
+            if size_cache is not None:
+                total_size = size_cache[str(path)][0]
             else:
                 total_size = self.file_utils.get_file_size(path)
-                if progress_bar:
-                    progress_bar.update(1)
             size_str = f" [{self.file_utils.format_size(total_size)}]"
             
-            if self.options.align_size:
-                max_width = self.calculate_max_name_length(path)
-                root_line = root_line.ljust(max_width) + size_str
+            if align_width:
+                root_line = root_line.ljust(align_width) + size_str
             else:
                 root_line += size_str
+        yield root_line
         
-        # プログレスバー完了
-        if progress_bar:
-            progress_bar.current = progress_bar.total
-            progress_bar._print_progress()
-            print()  # 改行
-        
-        # ツリーの生成
-        align_width = self.calculate_max_name_length(path) if self.options.align_size else None
-        child_lines = self.make_tree_lines(
-            path, align_width=align_width, progress_bar=progress_bar, is_root=True
-        )
-        
-        return root_line, child_lines
+        for line, size_str in rows:
+            yield self.format_row(line, size_str, align_width)
+    
+    def generate_tree_lines(self) -> Tuple[str, List[str]]:
+        """ツリーを生成して（ルート行, 子行のリスト）を返す"""
+        lines = self.iter_tree_lines()
+        root_line = next(lines)
+        return root_line, list(lines)
 
 
 class TreePrinter:
@@ -370,20 +516,16 @@ class TreePrinter:
     
     def print_tree(self):
         """ディレクトリツリーをprintする"""
-        root_line, child_lines = self.generator.generate_tree_lines()
-        print(root_line)
-        for line in child_lines:
-            print(line)
+        sys.stdout.writelines(line + "\n" for line in self.generator.iter_tree_lines())
     
     def save_tree(self, out_file: Path):
         """ディレクトリツリーをファイルに保存する"""
-        root_line, child_lines = self.generator.generate_tree_lines()
-        lines = [root_line] + child_lines
-        tree_str = "\n".join(lines)
-        
         out_file.parent.mkdir(exist_ok=True)
         with open(out_file, "w", encoding="utf-8") as f:
-            f.write(tree_str)
+            # 行を溜めずに書き出す（従来どおり最終行の後ろには改行を付けない）
+            lines = self.generator.iter_tree_lines()
+            f.write(next(lines))
+            f.writelines("\n" + line for line in lines)
         print(f"[INFO] ツリーを {out_file} に保存しました")
 
 
@@ -407,7 +549,8 @@ class ArgumentParser:
   python tree.py --max-files 20         # 最大表示ファイル数を20に設定
   python tree.py --output custom.txt    # 出力ファイル名を指定
   python tree.py --hidden               # 隠しファイルも表示
-  python tree.py --exclude "*.pyc" "*.log"  # 特定パターンを除外
+  python tree.py -e "*.pyc" -e "*.log"  # 特定パターンを除外
+  python tree.py --stat-threads 16      # サイズ計算を16スレッドで実行
             """
         )
 
@@ -468,7 +611,14 @@ class ArgumentParser:
         parser.add_argument(
             "--exclude", "-e",
             action="append",
-            help="除外するファイルパターン（複数指定可能）"
+            help="除外するファイルパターン（複数指定する場合は -e を繰り返す）"
+        )
+
+        parser.add_argument(
+            "--stat-threads", "-j",
+            type=int,
+            default=8,
+            help="サイズ計算に使うスレッド数（デフォルト: 8、1で逐次）"
         )
 
         # 出力設定
@@ -501,7 +651,8 @@ class ArgumentParser:
             output_file=args.output,
             do_save=do_save,
             do_print=do_print,
-            exclude_patterns=args.exclude or []
+            exclude_patterns=args.exclude or [],
+            stat_threads=args.stat_threads
         )
 
 
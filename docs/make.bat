@@ -9,6 +9,9 @@ if "%SPHINXBUILD%" == "" (
 )
 set SOURCEDIR=.
 set BUILDDIR=_build
+if "%SPHINXOPTS%" == "" (
+	set SPHINXOPTS=-j auto
+)
 
 %SPHINXBUILD% >NUL 2>NUL
 if errorlevel 9009 (
@@ -135,7 +135,7 @@ class BaseStorage(ABC):
 
     def get_collections(self) -> List[str]:
         """すべてのコレクション名を取得"""
-        records = self.metadataMgr.get_all()
+        records = self.metadataMgr.get_all(["collection"])
         collections = set()
         for record in records:
             if record.get("collection"):
@@ -144,7 +144,7 @@ class BaseStorage(ABC):
 
     def get_stats(self) -> Dict[str, Any]:
         """統計情報を取得"""
-        all_records = self.metadataMgr.get_all()
+        all_records = self.metadataMgr.get_all(["file_size"])
 
         total_size = sum(record.get("file_size", 0) for record in all_records)
         collections = self.get_collections()
@@ -160,15 +160,25 @@ class BaseStorage(ABC):
 class BaseMetadataManager(ABC):
     """メタデータ管理の基底クラス"""
 
-    def __init__(self, db_path: str, table_name: str, schema: Dict[str, str]):
+    def __init__(
+        self,
+        db_path: str,
+        table_name: str,
+        schema: Dict[str, str],
+        indexes: Tuple[str, ...] = (),
+    ):
         self.db = SQLiteManager(Path(db_path))
         self.table_name = table_name
         self.schema = schema
+        self.indexes = indexes
         self._initialize_tables()
 
     def _initialize_tables(self):
-        """テーブル初期化"""
-        self.db.create_table(self.table_name, self.schema)
+        """テーブル初期化（検索に使う列のインデックスも作成）"""
+        with self.db:
+            self.db.create_table(self.table_name, self.schema)
+            for column in self.indexes:
+                self.db.create_index(self.table_name, (column,))
 
     def save_metadata(self, **kwargs) -> int | None:
         """
@@ -217,9 +227,9 @@ class BaseMetadataManager(ABC):
         """メタデータを削除"""
         self.db.delete(self.table_name, "id = ?", (record_id,))
 
-    def get_all(self) -> List[Dict]:
-        """全レコードを取得"""
-        return self.db.fetch_all(self.table_name)
+    def get_all(self, columns: List[str] | None = None) -> List[Dict]:
+        """全レコードを取得（columnsを指定するとその列だけ取得）"""
+        return self.db.fetch_all(self.table_name, columns)
 
     def search(self, condition: str, params: tuple) -> List[Dict]:
         """条件検索"""
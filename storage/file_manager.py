@@ -45,10 +45,12 @@ class FileManager:
 
             with Image.open(image_path) as img:
                 # RGB変換（RGBA対応）
+                # 縮小前に変換する。縮小後だとアルファの乗算で透明部分が黒になる
                 if img.mode in ("RGBA", "LA", "P"):
                     img = img.convert("RGB")
 
-                img.thumbnail(self.thumbnail_size, Image.Resampling.LANCZOS)
+                # JPEG は thumbnail 内の draft() で縮小デコードされる
+                img.thumbnail(self.thumbnail_size, Image.Resampling.BICUBIC)
                 img.save(thumbnail_path, "JPEG", optimize=True, quality=85)
 
             return thumbnail_path
@@ -6,7 +6,7 @@ from pathlib import Path
 
 from .base_managers import BaseStorage, BaseMetadataManager
 from .file_manager import FileManager
-from db.models import FLASHCARD_SCHEMA
+from db.models import FLASHCARD_SCHEMA, FLASHCARD_INDEXES
 
 
 class FlashcardStorage(BaseStorage):
@@ -119,7 +119,7 @@ class FlashcardMetadataManager(BaseMetadataManager):
     """フラッシュカードメタデータ管理"""
 
     def __init__(self, db_path: str, schema: Dict[str, str]):
-        super().__init__(db_path, "flashcards", schema)
+        super().__init__(db_path, "flashcards", schema, FLASHCARD_INDEXES)
 
     def get_specific_fields(self, record_id: int) -> Optional[Dict]:
         """フラッシュカード固有のフィールドを取得"""
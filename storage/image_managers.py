@@ -6,7 +6,7 @@ from PIL import Image
 
 from .base_managers import BaseStorage, BaseMetadataManager
 from .file_manager import FileManager
-from db.models import IMAGE_SCHEMA
+from db.models import IMAGE_SCHEMA, IMAGE_INDEXES
 
 ##
 # @brief 画像ストレージ管理クラス
@@ -147,7 +147,7 @@ class ImageMetadataManager(BaseMetadataManager):
     """画像メタデータ管理"""
 
     def __init__(self, db_path: str, schema: Dict[str, str]):
-        super().__init__(db_path, "images", schema)
+        super().__init__(db_path, "images", schema, IMAGE_INDEXES)
 
     def get_specific_fields(self, record_id: int) -> Optional[Dict]:
         """画像固有のフィールドを取得"""
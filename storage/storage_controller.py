@@ -6,7 +6,7 @@ from pathlib import Path
 from .image_managers import ImageStorage
 from .flashcard_managers import FlashcardStorage
 from db import SQLiteManager
-from db.models import IMAGE_SCHEMA, FLASHCARD_SCHEMA
+from db.models import IMAGE_SCHEMA, IMAGE_INDEXES, FLASHCARD_SCHEMA, FLASHCARD_INDEXES
 from utils import log
 
 
@@ -16,10 +16,12 @@ class StorageController:
     FILETYPE_INFO = {
         "image": {
             "schema": IMAGE_SCHEMA,
+            "indexes": IMAGE_INDEXES,
             "storage_class": ImageStorage,
         },
         "flashcard": {
             "schema": FLASHCARD_SCHEMA,
+            "indexes": FLASHCARD_INDEXES,
             "storage_class": FlashcardStorage,
         },
     }
@@ -103,7 +105,10 @@ class StorageController:
                 log.info(f"{file_type}データベースを作成: {db_path}")
 
             db = SQLiteManager(db_path)
-            db.create_table(table_name, schema)
+            with db:
+                db.create_table(table_name, schema)
+                for column in info["indexes"]:
+                    db.create_index(table_name, (column,))
             db.close()
 
         log.info("データベースセットアップ完了")
@@ -44,6 +44,50 @@ class TestSQLiteManager(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result[0], "users")
 
+    def test_new_database_pragmas(self):
+        """新規DBのページサイズ・auto_vacuum設定と空きページ回収のテスト"""
+        raw = self.db_manager.execute_raw_rows
+        self.assertEqual(next(raw("PRAGMA page_size"))[0], 8192)
+        self.assertEqual(next(raw("PRAGMA auto_vacuum"))[0], 2)  # INCREMENTAL
+
+        columns = {"id": "INTEGER PRIMARY KEY", "blob": "TEXT"}
+        self.db_manager.create_table("vacuum_target", columns)
+        self.db_manager.bulk_insert(
+            "vacuum_target", [{"blob": "x" * 4000} for _ in range(50)]
+        )
+        self.db_manager.delete("vacuum_target", "id > ?", (0,))
+        self.assertGreater(next(raw("PRAGMA freelist_count"))[0], 0)
+
+        self.db_manager.incremental_vacuum()
+        self.assertEqual(next(raw("PRAGMA freelist_count"))[0], 0)
+
+    def test_slots(self):
+        """インスタンス辞書を持たないことのテスト"""
+        self.assertFalse(hasattr(self.db_manager, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.db_manager.unknown_attribute = 1
+
+    def test_create_index(self):
+        """インデックス作成のテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT", "age": "INTEGER"}
+        self.db_manager.create_table("indexed", columns)
+        self.db_manager.create_index("indexed", ("age",))
+        # 2回目はエラーにならない
+        self.db_manager.create_index("indexed", ("age",))
+
+        names = [
+            row["name"]
+            for row in self.db_manager.execute_raw_rows("PRAGMA index_list(indexed)")
+        ]
+        self.assertIn("idx_indexed_age", names)
+        plan = " ".join(
+            row[3]
+            for row in self.db_manager.execute_raw_rows(
+                "EXPLAIN QUERY PLAN SELECT * FROM indexed WHERE age = ?", (30,)
+            )
+        )
+        self.assertIn("idx_indexed_age", plan)
+
     def test_insert_single_record(self):
         """単一レコード挿入のテスト"""
         # テーブル作成
@@ -79,6 +123,36 @@ class TestSQLiteManager(unittest.TestCase):
         all_students = self.db_manager.fetch_all("students")
         self.assertEqual(len(all_students), 3)
 
+    def test_bulk_insert(self):
+        """一括挿入のテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT", "score": "REAL"}
+        self.db_manager.create_table("bulk_students", columns)
+
+        students = [{"name": f"Student {i}", "score": float(i)} for i in range(100)]
+        inserted = self.db_manager.bulk_insert("bulk_students", students)
+        self.assertEqual(inserted, 100)
+
+        all_students = self.db_manager.fetch_all("bulk_students")
+        self.assertEqual(len(all_students), 100)
+        self.assertEqual(all_students[-1]["name"], "Student 99")
+
+        # 空リストは何もしない
+        self.assertEqual(self.db_manager.bulk_insert("bulk_students", []), 0)
+
+        # 列構成が揃っていない行があれば何も挿入しない
+        mixed = [{"name": "X", "score": 1.0}, {"name": "Y"}]
+        self.assertEqual(self.db_manager.bulk_insert("bulk_students", mixed), 0)
+        self.assertEqual(len(self.db_manager.fetch_all("bulk_students")), 100)
+
+    def test_bulk_insert_rollback(self):
+        """一括挿入で制約違反があれば全件ロールバックされるテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "email": "TEXT UNIQUE"}
+        self.db_manager.create_table("bulk_users", columns)
+
+        rows = [{"email": "a@example.com"}, {"email": "a@example.com"}]
+        self.assertEqual(self.db_manager.bulk_insert("bulk_users", rows), 0)
+        self.assertEqual(len(self.db_manager.fetch_all("bulk_users")), 0)
+
     def test_fetch_all(self):
         """全データ取得のテスト"""
         columns = {"id": "INTEGER PRIMARY KEY", "product": "TEXT", "price": "REAL"}
@@ -143,6 +217,67 @@ class TestSQLiteManager(unittest.TestCase):
         )
         self.assertEqual(len(specific_people), 2)
 
+    def test_iter_where(self):
+        """条件付きストリーミング取得のテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "value": "INTEGER"}
+        self.db_manager.create_table("numbers", columns)
+        self.db_manager.bulk_insert("numbers", [{"value": i} for i in range(50)])
+
+        rows = self.db_manager.iter_where("numbers", "value >= ?", (40,))
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual([row["value"] for row in rows], list(range(40, 50)))
+
+    def test_iter_all(self):
+        """全件ストリーミング取得のテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "value": "INTEGER"}
+        self.db_manager.create_table("stream", columns)
+        self.db_manager.bulk_insert("stream", [{"value": i} for i in range(25)])
+
+        rows = self.db_manager.iter_all("stream", chunk=10)
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual([row["value"] for row in rows], list(range(25)))
+
+    def test_reads_after_write_during_iteration(self):
+        """走査中の iter_all があっても、自スレッドの書き込み後の読み取りが最新になるかのテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "value": "INTEGER"}
+        self.db_manager.create_table("stream_write", columns)
+        self.db_manager.bulk_insert("stream_write", [{"value": i} for i in range(30)])
+
+        rows = self.db_manager.iter_all("stream_write", chunk=10)
+        next(rows)
+        self.db_manager.insert("stream_write", {"value": 100})
+        self.assertEqual(self.db_manager.count("stream_write"), 31)
+        self.assertTrue(self.db_manager.exists("stream_write", "value = ?", (100,)))
+        self.assertEqual(
+            len(self.db_manager.fetch_where("stream_write", "value = ?", (100,))), 1
+        )
+        self.assertEqual(len(list(rows)), 29)
+
+        # 読み取り専用接続は後から開くため、パスは絶対パスで保持する
+        self.assertTrue(os.path.isabs(self.db_manager.db_path))
+
+    def test_begin_commit_rollback(self):
+        """begin()/commit()/rollback() による明示的なトランザクションのテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT"}
+        self.db_manager.create_table("explicit_tx", columns)
+
+        self.db_manager.begin()
+        self.db_manager.insert("explicit_tx", {"name": "discarded"})
+        self.db_manager.rollback()
+        self.assertEqual(self.db_manager.count("explicit_tx"), 0)
+
+        self.db_manager.begin()
+        self.db_manager.insert("explicit_tx", {"name": "kept"})
+        # ネストした begin は SAVEPOINT になり、内側だけを巻き戻す
+        self.db_manager.begin()
+        self.db_manager.insert("explicit_tx", {"name": "inner"})
+        self.db_manager.rollback()
+        self.db_manager.commit()
+        self.assertEqual(
+            [row["name"] for row in self.db_manager.fetch_all("explicit_tx")], ["kept"]
+        )
+        self.assertFalse(self.db_manager.conn.in_transaction)
+
     def test_update(self):
         """データ更新のテスト"""
         columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT", "status": "TEXT"}
@@ -181,6 +316,243 @@ class TestSQLiteManager(unittest.TestCase):
         self.assertEqual(updated_task[0]["name"], "Updated Task")
         self.assertEqual(updated_task[0]["status"], "in_progress")
 
+    def test_update_many(self):
+        """複数レコード一括更新のテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT", "status": "TEXT"}
+        self.db_manager.create_table("many_tasks", columns)
+        self.db_manager.bulk_insert(
+            "many_tasks", [{"name": f"Task {i}", "status": "pending"} for i in range(5)]
+        )
+
+        updated = self.db_manager.update_many(
+            "many_tasks",
+            [{"id": 1, "status": "completed"}, {"id": 3, "status": "completed"}],
+            ("id",),
+        )
+        self.assertEqual(updated, 2)
+
+        completed = self.db_manager.fetch_where(
+            "many_tasks", "status = ?", ("completed",)
+        )
+        self.assertEqual([row["id"] for row in completed], [1, 3])
+
+        # 列構成が揃っていない行があれば何も更新しない
+        updated = self.db_manager.update_many(
+            "many_tasks",
+            [{"id": 2, "status": "completed"}, {"id": 4}],
+            ("id",),
+        )
+        self.assertEqual(updated, 0)
+        self.assertEqual(
+            self.db_manager.count("many_tasks", "status = ?", ("completed",)), 2
+        )
+
+    def test_delete_many(self):
+        """複数条件一括削除のテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "item": "TEXT"}
+        self.db_manager.create_table("many_items", columns)
+        self.db_manager.bulk_insert("many_items", [{"item": f"I{i}"} for i in range(5)])
+
+        deleted = self.db_manager.delete_many(
+            "many_items", "item = ?", [("I0",), ("I2",), ("missing",)]
+        )
+        self.assertEqual(deleted, 2)
+        remaining = [row["item"] for row in self.db_manager.fetch_all("many_items")]
+        self.assertEqual(remaining, ["I1", "I3", "I4"])
+
+    def test_concurrent_reads(self):
+        """別スレッドからの読み取りがスレッドごとの接続で行われるかのテスト"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT"}
+        self.db_manager.create_table("readers", columns)
+        self.db_manager.bulk_insert("readers", [{"name": f"R{i}"} for i in range(10)])
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(
+                    lambda _: len(self.db_manager.fetch_all("readers")), range(8)
+                )
+            )
+        self.assertEqual(results, [10] * 8)
+
+        # トランザクション中は未コミットの変更も読める
+        with self.db_manager:
+            self.db_manager.insert("readers", {"name": "pending"})
+            self.assertEqual(len(self.db_manager.fetch_all("readers")), 11)
+
+    def test_reader_released_when_thread_ends(self):
+        """スレッド終了時にそのスレッドの読み取り接続が手放されるかのテスト"""
+        import gc
+        import threading
+
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT"}
+        self.db_manager.create_table("short_lived", columns)
+        self.db_manager.insert("short_lived", {"name": "A"})
+
+        results = []
+
+        def worker():
+            results.append(
+                len(self.db_manager.fetch_where("short_lived", "name = ?", ("A",)))
+            )
+
+        for _ in range(50):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        gc.collect()
+
+        self.assertEqual(results, [1] * 50)
+        self.assertEqual(len(self.db_manager._readers), 0)
+
+    def test_fetch_columns(self):
+        """取得列を指定した取得のテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT", "age": "INTEGER"}
+        self.db_manager.create_table("projected", columns)
+        self.db_manager.insert("projected", {"name": "Alice", "age": 30})
+
+        self.assertEqual(
+            self.db_manager.fetch_all("projected", ["name"]), [{"name": "Alice"}]
+        )
+        self.assertEqual(
+            self.db_manager.fetch_where("projected", "age = ?", (30,), ["id", "age"]),
+            [{"id": 1, "age": 30}],
+        )
+        # テーブルにない列名はSQLに埋め込まずに拒否する
+        with self.assertRaises(ValueError):
+            self.db_manager.fetch_all("projected", ["name; DROP TABLE projected"])
+
+    def test_count_and_exists(self):
+        """件数取得と存在確認のテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT", "age": "INTEGER"}
+        self.db_manager.create_table("people", columns)
+        self.db_manager.bulk_insert(
+            "people",
+            [
+                {"name": "Alice", "age": 30},
+                {"name": "Bob", "age": 35},
+                {"name": "Carol", "age": 35},
+            ],
+        )
+
+        self.assertEqual(self.db_manager.count("people"), 3)
+        self.assertEqual(self.db_manager.count("people", "age = ?", (35,)), 2)
+        self.assertTrue(self.db_manager.exists("people", "name = ?", ("Alice",)))
+        self.assertFalse(self.db_manager.exists("people", "name = ?", ("Dave",)))
+        self.assertEqual(self.db_manager.count("non_existent_table"), 0)
+
+    def test_query_cache(self):
+        """SELECT結果キャッシュと更新時の破棄のテスト"""
+        # 既定ではキャッシュしない
+        self.assertEqual(self.db_manager._query_cache_rows, 0)
+        self.db_manager.close()
+        self.db_manager = SQLiteManager(self.db_path, query_cache_rows=3)
+
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT", "age": "INTEGER"}
+        self.db_manager.create_table("cached", columns)
+        self.db_manager.insert("cached", {"name": "Alice", "age": 30})
+
+        first = self.db_manager.fetch_where("cached", "age >= ?", (18,))
+        # 返された辞書を書き換えてもキャッシュには影響しない
+        first[0]["name"] = "changed"
+        second = self.db_manager.fetch_where("cached", "age >= ?", (18,))
+        self.assertEqual(second[0]["name"], "Alice")
+
+        # 更新するとキャッシュが破棄され、新しい結果が返る
+        self.db_manager.update("cached", {"age": 31}, "name = ?", ("Alice",))
+        self.assertEqual(
+            self.db_manager.fetch_where("cached", "age >= ?", (18,))[0]["age"], 31
+        )
+        self.db_manager.insert("cached", {"name": "Bob", "age": 40})
+        self.assertEqual(len(self.db_manager.fetch_all("cached")), 2)
+
+        # 別の接続からの変更も検知する
+        other = SQLiteManager(self.db_path)
+        other.delete("cached", "name = ?", ("Bob",))
+        other.close()
+        self.assertEqual(len(self.db_manager.fetch_all("cached")), 1)
+
+        # キャッシュは合計行数で制限され、上限を超えた分は古い結果から捨てられる
+        self.db_manager.bulk_insert(
+            "cached", [{"name": f"N{i}", "age": i} for i in range(3)]
+        )
+        self.db_manager.fetch_all("cached")  # 4行: 上限を超えるのでキャッシュしない
+        self.db_manager.fetch_where("cached", "age >= ?", (1,))  # 3行
+        self.db_manager.fetch_where("cached", "age = ?", (0,))  # 1行
+        self.assertEqual(len(self.db_manager._query_cache), 1)
+        self.assertLessEqual(self.db_manager._query_cache_total, 3)
+
+    def test_concurrent_writes(self):
+        """複数スレッドからの書き込みが直列化されるかのテスト"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT"}
+        self.db_manager.create_table("writers", columns)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ids = list(
+                executor.map(
+                    lambda i: self.db_manager.insert("writers", {"name": f"W{i}"}),
+                    range(50),
+                )
+            )
+        # lastrowid が他スレッドの挿入と混ざらない
+        self.assertEqual(sorted(ids), list(range(1, 51)))
+
+        # 他スレッドのトランザクションのロールバックに巻き込まれない
+        entered = threading.Event()
+        release = threading.Event()
+
+        def failing_transaction():
+            try:
+                with self.db_manager:
+                    self.db_manager.insert("writers", {"name": "rolled back"})
+                    entered.set()
+                    release.wait(5)
+                    raise RuntimeError("rollback")
+            except RuntimeError:
+                pass
+
+        worker = threading.Thread(target=failing_transaction)
+        worker.start()
+        entered.wait(5)
+        # トランザクション中の他スレッドからは未コミットの行は見えない
+        self.assertEqual(self.db_manager.count("writers"), 50)
+        inserter = threading.Thread(
+            target=self.db_manager.insert, args=("writers", {"name": "kept"})
+        )
+        inserter.start()
+        release.set()
+        worker.join()
+        inserter.join()
+
+        names = [row["name"] for row in self.db_manager.fetch_all("writers")]
+        self.assertIn("kept", names)
+        self.assertNotIn("rolled back", names)
+
+    def test_prepared_update(self):
+        """準備済みUPDATEの繰り返し実行のテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "score": "INTEGER"}
+        self.db_manager.create_table("scores", columns)
+        self.db_manager.bulk_insert("scores", [{"score": 0} for _ in range(5)])
+
+        run = self.db_manager.prepared_update("scores", ("score",), "id = ?")
+        with self.db_manager:
+            for record_id in range(1, 6):
+                run((record_id * 10,), (record_id,))
+
+        scores = [row["score"] for row in self.db_manager.fetch_all("scores")]
+        self.assertEqual(scores, [10, 20, 30, 40, 50])
+
+        # with文の外では呼び出しごとにコミットされる
+        run((99,), (1,))
+        self.assertFalse(self.db_manager.conn.in_transaction)
+        self.assertEqual(
+            self.db_manager.fetch_where("scores", "id = ?", (1,))[0]["score"], 99
+        )
+
     def test_delete(self):
         """データ削除のテスト"""
         columns = {"id": "INTEGER PRIMARY KEY", "item": "TEXT", "category": "TEXT"}
@@ -278,6 +650,102 @@ class TestSQLiteManager(unittest.TestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]["name"], "Test Record")
 
+    def test_get_table_schema(self):
+        """スキーマ取得とキャッシュのテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT", "age": "INTEGER"}
+        self.db_manager.create_table("schema_test", columns)
+
+        self.assertEqual(
+            self.db_manager.get_column_names("schema_test"), ["id", "name", "age"]
+        )
+        schema = self.db_manager.get_table_schema("schema_test")
+        self.assertEqual(schema[1]["type"], "TEXT")
+
+        # 2回目はキャッシュから同じオブジェクトが返る
+        self.assertIs(self.db_manager.get_table_schema("schema_test"), schema)
+
+        # DDL後はinvalidate_schemaで再取得される
+        self.db_manager.cursor.execute("ALTER TABLE schema_test ADD COLUMN email TEXT")
+        self.db_manager.invalidate_schema("schema_test")
+        self.assertIn("email", self.db_manager.get_column_names("schema_test"))
+
+        # 存在しないテーブル
+        self.assertEqual(self.db_manager.get_table_schema("no_such_table"), [])
+
+    def test_attach_scratch(self):
+        """メモリ上の作業用DBを経由した一括反映のテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "word": "TEXT"}
+        self.db_manager.create_table("words", columns)
+
+        scratch = self.db_manager.attach_scratch()
+        # 2回呼んでもエラーにならない
+        self.assertEqual(self.db_manager.attach_scratch(), scratch)
+
+        self.db_manager.create_table(f"{scratch}.words", columns)
+        self.db_manager.bulk_insert(
+            f"{scratch}.words", [{"word": f"w{i}"} for i in range(10)]
+        )
+        self.assertEqual(len(self.db_manager.fetch_all("words")), 0)
+
+        with self.db_manager:
+            self.db_manager.conn.execute(
+                f"INSERT INTO main.words SELECT * FROM {scratch}.words"
+            )
+        self.assertEqual(len(self.db_manager.fetch_all("words")), 10)
+
+    def test_execute_raw_rows_commits(self):
+        """execute_raw_rows で実行した書き込みがwith文の外では即時コミットされるかのテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "word": "TEXT"}
+        self.db_manager.create_table("raw_words", columns)
+
+        self.db_manager.execute_raw_rows(
+            "INSERT INTO raw_words (word) VALUES (?)", ("raw",)
+        )
+        self.assertFalse(self.db_manager.conn.in_transaction)
+
+        self.db_manager.close()
+        self.db_manager = SQLiteManager(self.db_path)
+        self.assertEqual(self.db_manager.count("raw_words"), 1)
+
+    def test_transaction_commit(self):
+        """with文で複数操作を1トランザクションにまとめるテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT"}
+        self.db_manager.create_table("tx_users", columns)
+
+        with self.db_manager:
+            self.db_manager.insert("tx_users", {"name": "Alice"})
+            self.db_manager.insert("tx_users", {"name": "Bob"})
+            # 範囲内ではまだコミットされていない
+            self.assertTrue(self.db_manager.conn.in_transaction)
+
+        self.assertFalse(self.db_manager.conn.in_transaction)
+        self.assertEqual(len(self.db_manager.fetch_all("tx_users")), 2)
+
+    def test_transaction_rollback(self):
+        """with文内で例外が起きた場合のロールバックのテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "name": "TEXT"}
+        self.db_manager.create_table("tx_users", columns)
+
+        with self.assertRaises(RuntimeError):
+            with self.db_manager:
+                self.db_manager.insert("tx_users", {"name": "Alice"})
+                raise RuntimeError("abort")
+
+        self.assertEqual(len(self.db_manager.fetch_all("tx_users")), 0)
+
+    def test_nested_bulk_insert_rollback(self):
+        """トランザクション内のbulk_insert失敗は外側の操作を巻き戻さないテスト"""
+        columns = {"id": "INTEGER PRIMARY KEY", "email": "TEXT UNIQUE"}
+        self.db_manager.create_table("tx_emails", columns)
+
+        with self.db_manager:
+            self.db_manager.insert("tx_emails", {"email": "a@example.com"})
+            rows = [{"email": "b@example.com"}, {"email": "b@example.com"}]
+            self.assertEqual(self.db_manager.bulk_insert("tx_emails", rows), 0)
+
+        emails = [row["email"] for row in self.db_manager.fetch_all("tx_emails")]
+        self.assertEqual(emails, ["a@example.com"])
+
 
 def run_all_tests():
     """全てのテストを実行する関数"""
@@ -292,6 +292,29 @@ class TestStorageControllerEdgeCases:
         controller2.cleanup()
 
 
+class TestFileManagerThumbnail:
+    """FileManager.create_thumbnail のテスト"""
+
+    def test_transparent_png_keeps_stored_color(self, file_manager, temp_dir):
+        """透明部分は黒にならず、保存されている色のままサムネイル化される"""
+        from PIL import Image
+
+        image_path = temp_dir / "transparent.png"
+        img = Image.new("RGBA", (800, 800), (255, 255, 255, 0))
+        img.paste((255, 0, 0, 255), (200, 200, 600, 600))
+        img.save(image_path)
+
+        thumbnail_path = file_manager.create_thumbnail(image_path)
+
+        assert thumbnail_path is not None
+        with Image.open(thumbnail_path) as thumb:
+            assert thumb.mode == "RGB"
+            assert max(thumb.size) <= 200
+            assert all(c > 240 for c in thumb.getpixel((0, 0)))
+            r, g, b = thumb.getpixel((thumb.width // 2, thumb.height // 2))
+            assert r > 200 and g < 60 and b < 60
+
+
 class TestStorageControllerIntegration:
     """統合テスト"""
 
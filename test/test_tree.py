@@ -0,0 +1,77 @@
+import unittest
+import os
+import tempfile
+import importlib.util
+from pathlib import Path
+
+# dev/ はパッケージではないため、tree.py をファイルから読み込む
+_spec = importlib.util.spec_from_file_location(
+    "dev_tree", Path(__file__).parent.parent / "dev" / "tree.py"
+)
+tree = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(tree)
+
+
+class TestDirectoryTree(unittest.TestCase):
+
+    def setUp(self):
+        """テスト前の準備 - 一時ディレクトリにツリーを作成"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name) / "root"
+        # 並列走査になるよう、しきい値より多くのサブディレクトリを作る
+        for i in range(tree.PARALLEL_SCAN_THRESHOLD + 2):
+            (self.root / f"d{i}").mkdir(parents=True)
+            (self.root / f"d{i}" / "small.txt").write_bytes(b"x" * 100)
+
+    def tearDown(self):
+        """テスト後のクリーンアップ - 一時ディレクトリを削除"""
+        self.temp_dir.cleanup()
+
+    def generate(self, **kwargs):
+        options = tree.TreeOptions(self.root, do_save=False, do_print=False, **kwargs)
+        return list(tree.DirectoryTreeGenerator(options).iter_tree_lines())
+
+    def test_hardlinks_independent_of_stat_threads(self):
+        """兄弟ディレクトリにあるハードリンクのサイズが並列数によらず同じになるかのテスト"""
+        linked = self.root / "d0" / "linked.bin"
+        linked.write_bytes(b"y" * 5000)
+        try:
+            os.link(linked, self.root / "d1" / "linked.bin")
+        except (OSError, NotImplementedError):
+            self.skipTest("hard links are not supported")
+
+        sequential = tree.FileUtils.scan_directory_sizes(self.root, workers=1)
+        parallel = tree.FileUtils.scan_directory_sizes(self.root, workers=4)
+        self.assertEqual(sequential, parallel)
+
+        # 各ディレクトリは自分のリンクを数え、重複分はルートの合計からだけ除く
+        self.assertEqual(sequential[str(self.root / "d0")][0], 5100)
+        self.assertEqual(sequential[str(self.root / "d1")][0], 5100)
+        files = tree.PARALLEL_SCAN_THRESHOLD + 2
+        self.assertEqual(sequential[str(self.root)], (files * 100 + 5000, files + 2))
+
+        self.assertEqual(self.generate(stat_threads=1), self.generate(stat_threads=4))
+
+    def test_exclude_patterns(self):
+        """--exclude の指定が表示とサイズ集計の両方に効くかのテスト"""
+        (self.root / "d0" / "skip.log").write_bytes(b"z" * 1000)
+        (self.root / "build").mkdir()
+        (self.root / "build" / "out.bin").write_bytes(b"z" * 3000)
+
+        args = tree.ArgumentParser.setup_parser().parse_args(
+            ["--exclude", "*.log", str(self.root), "-e", "build"]
+        )
+        self.assertEqual(args.path, str(self.root))
+        self.assertEqual(args.exclude, ["*.log", "build"])
+
+        for threads in (1, 4):
+            lines = self.generate(exclude_patterns=args.exclude, stat_threads=threads)
+            self.assertFalse(
+                any("skip.log" in line or "build" in line for line in lines)
+            )
+            files = tree.PARALLEL_SCAN_THRESHOLD + 2
+            self.assertIn(f"[{files * 100}B]", lines[0])
+
+
+if __name__ == "__main__":
+    unittest.main()